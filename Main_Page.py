@@ -1,17 +1,15 @@
 import streamlit as st
-from main_tabs import (
-    dataset_overview,
-    preprocessing,
-)
-import pandas as pd
+from core.app_data import get_dataset, get_profile, get_quality_report
+from core.page_loading import PageTimer, is_open, lazy_tabs, render_if_open
 # Apply global style and logo
 
 
 # Set page config
 st.set_page_config(page_title="🧪 Project Overview", layout="wide")
+timer = PageTimer("Main_Page.py")
 
 
-df_filtered = pd.read_csv("data/kc_house_data.csv")
+df_filtered = get_dataset()
 
 # ---- Main Content ----
 st.title("🏡 King County House Sales Project Overview")
@@ -22,11 +20,11 @@ if st.button("📈 Open Dashboard"):
     st.switch_page("pages/Dashboard.py")
 
 # Tabs
-tab1, tab2, tab3 = st.tabs([
+tab1, tab2, tab3 = lazy_tabs([
     "📌 The Project",
     "📊 Dataset Overview",
     "🛠️ Preprocessing and Cleaning"
-])
+], key="overview_tab")
 
 
 with tab1:
@@ -72,12 +70,13 @@ Analyzing this dataset allows us to:
 
     # Path from root
 
-with tab2:
-   dataset_overview.render(df_filtered)
-
-with tab3:
-    
-    preprocessing.render(df_filtered)
+# Both tabs read the cached one-pass profile instead of scanning the frame
+profile = get_profile() if is_open(tab2) or is_open(tab3) else None
+render_if_open(tab2, "main_tabs.dataset_overview", df_filtered, profile, timer=timer)
+quality = get_quality_report() if is_open(tab3) else None
+render_if_open(tab3, "main_tabs.preprocessing", df_filtered, profile, quality, timer=timer)
 
 # ---- Optional main page button ----
 st.markdown("---")
+
+timer.finish()
@@ -0,0 +1,103 @@
+# core/aggregates.py
+# Materialized price aggregates behind the dashboard's group-by charts.
+import numpy as np
+import pandas as pd
+
+# Dimensions the General Insights / Numerical Analysis charts group by
+CUBE_DIMENSIONS = [
+    'lot_size_range', 'view', 'condition', 'was_renovated',
+    'waterfront_label', 'floors_rounded', 'bedrooms', 'month',
+]
+
+
+def _encode(values: pd.Series):
+    """Integer codes (-1 = missing) and the level for each code."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Keep the categorical dtype so merged tables stay in category order
+        levels = pd.CategoricalIndex(values.cat.categories, dtype=values.dtype)
+        return values.cat.codes.to_numpy(), levels
+    arr = values.to_numpy()
+    if arr.dtype.kind in 'iu' and len(arr):
+        lo, hi = int(arr.min()), int(arr.max())
+        if hi - lo <= 100_000:
+            # Small integer domain: offset codes avoid a sort
+            return (arr - lo).astype(np.intp), pd.RangeIndex(lo, hi + 1)
+    codes, levels = pd.factorize(values, sort=True)
+    return codes, pd.Index(levels)
+
+
+def _table(codes, levels, measure) -> pd.DataFrame:
+    valid = codes >= 0
+    codes, measure = codes[valid], measure[valid]
+    n = len(levels)
+    table = pd.DataFrame({
+        'count': np.bincount(codes, minlength=n).astype(np.int64),
+        'sum': np.bincount(codes, weights=measure, minlength=n),
+        'sumsq': np.bincount(codes, weights=measure * measure, minlength=n),
+    }, index=levels)
+    return table
+
+
+class AggregateCube:
+    """
+    Per-dimension count / sum / sum-of-squares of one measure (price).
+
+    Each table has one row per level, so charts read O(groups) values no
+    matter how many sales are behind them. Cubes over disjoint row sets add
+    up with `merge`, which is how `from_chunks` scales past memory.
+    """
+
+    def __init__(self, tables: dict[str, pd.DataFrame], measure='price'):
+        self.tables = tables
+        self.measure = measure
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions=None, measure='price', mask=None):
+        dimensions = [d for d in (dimensions or CUBE_DIMENSIONS) if d in df.columns]
+        values = df[measure].to_numpy(dtype=np.float64)
+        if mask is not None:
+            values = values[mask]
+        tables = {}
+        for dim in dimensions:
+            codes, levels = _encode(df[dim])
+            if mask is not None:
+                codes = codes[mask]
+            tables[dim] = _table(codes, levels, values)
+        return cls(tables, measure)
+
+    @classmethod
+    def from_chunks(cls, chunks, dimensions=None, measure='price'):
+        cube = None
+        for chunk in chunks:
+            part = cls.from_frame(chunk, dimensions, measure)
+            cube = part if cube is None else cube.merge(part)
+        return cube
+
+    def merge(self, other: 'AggregateCube') -> 'AggregateCube':
+        tables = {}
+        for dim in self.tables.keys() | other.tables.keys():
+            parts = [t for t in (self.tables.get(dim), other.tables.get(dim)) if t is not None]
+            merged = pd.concat(parts).groupby(level=0, sort=True).sum()
+            merged.index.name = None
+            tables[dim] = merged
+        return AggregateCube(tables, self.measure)
+
+    def _stats(self, dim) -> pd.DataFrame:
+        table = self.tables[dim]
+        return table[table['count'] > 0]
+
+    def count(self, dim) -> pd.DataFrame:
+        """Rows per level as a two-column frame: [dim, 'count']."""
+        return self._stats(dim)['count'].rename_axis(dim).reset_index()
+
+    def mean(self, dim) -> pd.DataFrame:
+        """Mean of the measure per level as a two-column frame: [dim, measure]."""
+        t = self._stats(dim)
+        return (t['sum'] / t['count']).rename(self.measure).rename_axis(dim).reset_index()
+
+    def std(self, dim) -> pd.DataFrame:
+        """Sample standard deviation of the measure per level."""
+        t = self._stats(dim)
+        n = t['count']
+        var = (t['sumsq'] - t['sum'] ** 2 / n) / (n - 1).where(n > 1)
+        return np.sqrt(var.clip(lower=0)).rename(self.measure).rename_axis(dim).reset_index()
@@ -0,0 +1,175 @@
+# core/app_data.py
+# Streamlit-cached accessors shared by Main_Page and the pages/ scripts.
+import pandas as pd
+import streamlit as st
+
+from core.aggregates import AggregateCube
+from core.data_loader import DATA_PATH, file_fingerprint, load_dataset
+from core.features import compute_features
+from core.filters import FilterIndex, filters_key
+from core.readonly import FrozenFrame, freeze
+
+
+@st.cache_resource(show_spinner="Loading dataset...")
+def _load(fingerprint):
+    df, _ = load_dataset(fingerprint=fingerprint)
+    # The frame is freshly built from the Arrow cache (or CSV): freeze it in place
+    return freeze(df, copy=False)
+
+
+@st.cache_resource(show_spinner="Computing derived features...")
+def _load_with_features(fingerprint):
+    base = _load(fingerprint)
+    features = freeze(compute_features(base))
+    # Column-wise concat shares the frozen buffers of both frames
+    return FrozenFrame(pd.concat([base, features], axis=1), copy=False)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _fingerprint(path, size, mtime_ns):
+    return file_fingerprint(path)
+
+
+def get_fingerprint():
+    """Dataset version; the file is only re-hashed when its size or mtime changes."""
+    stat = DATA_PATH.stat()
+    return _fingerprint(str(DATA_PATH), stat.st_size, stat.st_mtime_ns)
+
+
+def get_dataset():
+    """
+    Read-only dataset, held once per process and shared by every session.
+
+    Pages and tabs must not write into it; derive what they need with
+    ``.assign(...)`` or selections instead.
+    """
+    return _load(get_fingerprint())
+
+
+def get_feature_dataset():
+    """get_dataset() plus the columns declared in core.features, also read-only."""
+    return _load_with_features(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Aggregating prices...")
+def _cube(fingerprint):
+    return AggregateCube.from_frame(_load_with_features(fingerprint))
+
+
+def get_cube():
+    """Price aggregate cube over get_feature_dataset(), one per dataset version."""
+    return _cube(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Indexing filter columns...")
+def _filter_index(fingerprint):
+    return FilterIndex(_load_with_features(fingerprint))
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _filtered(fingerprint, key):
+    df = _load_with_features(fingerprint)
+    mask = _filter_index(fingerprint).mask(dict(key))
+    if mask is None:
+        return df, _cube(fingerprint)
+    view = FrozenFrame(df[mask], copy=False)
+    return view, AggregateCube.from_frame(df, mask=mask)
+
+
+def get_filtered(filters: dict):
+    """
+    (filtered view, aggregate cube) for the sidebar `filters`.
+
+    The mask is resolved through the precomputed FilterIndex, and each
+    distinct filter combination is cached across sessions.
+    """
+    return _filtered(get_fingerprint(), filters_key(filters))
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _correlations(fingerprint, key):
+    from core.correlation import CorrelationState
+
+    return CorrelationState.from_frame(_filtered(fingerprint, key)[0])
+
+
+def get_correlations(filters: dict):
+    """
+    Co-moment state of the filtered view (see core/correlation.py), cached
+    per filter combination; the full heatmap and every subset read from it.
+    """
+    return _correlations(get_fingerprint(), filters_key(filters))
+
+
+@st.cache_resource(show_spinner="Indexing sale locations...")
+def _comps_index(fingerprint):
+    from core.comps import CompsIndex
+
+    return CompsIndex(_load(fingerprint))
+
+
+def get_comps_index():
+    """Spatial comparable-sales index over get_dataset(), one per dataset version."""
+    return _comps_index(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Binning sales into hexagons...")
+def _hex_index(fingerprint):
+    from core.hexgrid import HexGridIndex
+
+    return HexGridIndex(_load(fingerprint))
+
+
+def get_hex_index():
+    """Multi-resolution hexagon assignment of every sale, one per dataset version."""
+    return _hex_index(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Profiling columns...")
+def _profile(fingerprint):
+    from core.profiler import DatasetProfile
+
+    return DatasetProfile.from_frame(_load(fingerprint))
+
+
+def get_profile():
+    """One-pass column profile (moments, quantiles, distinct counts, top values) of get_dataset()."""
+    return _profile(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Fitting data-quality rules...")
+def _quality_rules(fingerprint):
+    from core.data_quality import QualityRules
+
+    return QualityRules.from_frame(_load(fingerprint))
+
+
+def get_quality_rules():
+    """Outlier fences and known sale keys of get_dataset(), used to gate new data."""
+    return _quality_rules(get_fingerprint())
+
+
+@st.cache_resource(show_spinner="Checking data quality...")
+def _quality_report(fingerprint):
+    from core.data_quality import check_frame
+
+    return check_frame(_load(fingerprint), _quality_rules(fingerprint))
+
+
+def get_quality_report():
+    """Data-quality findings for get_dataset(), one report per dataset version."""
+    return _quality_report(get_fingerprint())
+
+
+@st.cache_resource
+def _figure_cache():
+    from core.figure_cache import FigureCache
+
+    return FigureCache()
+
+
+def get_figure_scope(filters: dict):
+    """FigureScope over the shared figure cache for this dataset version and `filters`."""
+    from core.figure_cache import FigureScope
+
+    return FigureScope(_figure_cache(), get_fingerprint(), filters_key(filters))
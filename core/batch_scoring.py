@@ -0,0 +1,168 @@
+# core/batch_scoring.py
+# Chunked batch pricing of CSV files with the compiled price model.
+#
+# Command line:
+#   python -m core.batch_scoring houses.csv priced.csv [--chunk-rows 100000]
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.ridge_model import INPUT_FEATURES, NUMERIC_FEATURES, TARGET
+
+CHUNK_ROWS = 100_000
+PREDICTION_COLUMN = "predicted_price"
+CONTRIBUTION_PREFIX = "contrib_"
+# True where the data-quality gate kept a row from being priced
+REJECTED_COLUMN = "quality_rejected"
+
+
+def prepare_chunk(chunk: pd.DataFrame, reference_year: int) -> pd.DataFrame:
+    """
+    Normalize one input chunk to the model's raw inputs.
+
+    Column names are matched case-insensitively, `age_of_house` is derived
+    from `yr_built` when absent, and zipcodes are coerced to integers (unknown
+    zipcodes fall back to the baseline zipcode, as in training; the quality
+    gate rejects them, see QualityChecker).
+    """
+    chunk = chunk.rename(columns=lambda c: str(c).strip().lower())
+    if "age_of_house" not in chunk.columns and "yr_built" in chunk.columns:
+        chunk["age_of_house"] = reference_year - chunk["yr_built"]
+    missing = [c for c in INPUT_FEATURES if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+
+    inputs = chunk[INPUT_FEATURES].copy()
+    inputs[NUMERIC_FEATURES] = inputs[NUMERIC_FEATURES].apply(pd.to_numeric, errors="coerce")
+    inputs["zipcode"] = pd.to_numeric(inputs["zipcode"], errors="coerce").fillna(-1).astype(np.int64)
+    return inputs
+
+
+def score_stream(chunks, predictor, reference_year: int, write, progress=None,
+                 explain=False, rules=None) -> dict:
+    """
+    Score an iterable of DataFrame chunks and hand each scored chunk to
+    `write(chunk, first)`. Only one chunk is held in memory at a time.
+
+    With `explain`, each input's price contribution (own terms plus its
+    interaction shares, see CompiledPredictor.explain_arrays) is added as a
+    `contrib_<input>` column, next to `contrib_base`.
+
+    With data-quality `rules` (core/data_quality.py), every chunk is checked
+    first: rows with an error-level finding are not priced and are marked
+    in a `quality_rejected` column, and the findings are returned under
+    "quality".
+
+    Rows with non-numeric inputs get a NaN prediction. Returns throughput
+    stats: rows, seconds, rows_per_second.
+    """
+    if explain and not hasattr(predictor, "explain"):
+        raise ValueError("The selected model engine does not support price contributions")
+    checker = None
+    if rules is not None:
+        from core.data_quality import QualityChecker
+
+        checker = QualityChecker(rules, required=[c for c in INPUT_FEATURES if c != "age_of_house"])
+    start = time.perf_counter()
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        inputs = prepare_chunk(chunk, reference_year)
+        valid = inputs[NUMERIC_FEATURES].notna().all(axis=1).to_numpy()
+        if checker is not None:
+            # The price column, if any, is not a model input and is not judged
+            rejected = checker.check(chunk.drop(columns=[c for c in chunk.columns
+                                                         if str(c).strip().lower() == TARGET]))
+            valid = valid & ~rejected
+        prediction = np.full(len(inputs), np.nan)
+        prediction[valid] = predictor.predict(inputs[valid])
+
+        out = chunk.copy()
+        out[PREDICTION_COLUMN] = prediction.round(2)
+        if checker is not None:
+            out[REJECTED_COLUMN] = rejected
+        if explain:
+            base, main, interaction = predictor.explain(inputs[valid])
+            contributions = (main + interaction).round(2).add_prefix(CONTRIBUTION_PREFIX)
+            out[CONTRIBUTION_PREFIX + "base"] = np.where(valid, round(base, 2), np.nan)
+            out = out.join(contributions.set_axis(out.index[valid]))
+        write(out, i == 0)
+
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows, time.perf_counter() - start)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds > 0 else None,
+    }
+    if checker is not None:
+        stats["quality"] = checker.report
+    return stats
+
+
+def score_csv(source, destination, predictor, reference_year: int,
+              chunk_rows=CHUNK_ROWS, progress=None, explain=False, rules=None) -> dict:
+    """Stream `source` CSV (path or file object) into `destination` with predictions."""
+    chunks = pd.read_csv(source, chunksize=chunk_rows)
+
+    def write(out, first):
+        if hasattr(destination, "write"):
+            out.to_csv(destination, header=first, index=False)
+        else:
+            out.to_csv(destination, mode="w" if first else "a", header=first, index=False)
+
+    return score_stream(chunks, predictor, reference_year, write, progress, explain, rules)
+
+
+def load_predictor():
+    """(compiled predictor, model metadata) for the current dataset version."""
+    from core.compiled_predictor import compile_model
+    from core.data_loader import load_dataset
+    from core.features import compute_features
+    from core.ridge_model import load_or_train
+
+    df, fingerprint = load_dataset()
+    df = df.assign(age_of_house=compute_features(df)["age_of_house"])
+    model, meta = load_or_train(df, fingerprint)
+    return compile_model(model), meta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price every house in a CSV file.")
+    parser.add_argument("input", help="CSV with the King County house columns")
+    parser.add_argument("output", help="where to write the CSV with predicted_price")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--explain", action="store_true",
+                        help="add each input's contribution to the price (contrib_* columns)")
+    parser.add_argument("--no-quality-checks", action="store_true",
+                        help="price every row without the data-quality gate")
+    args = parser.parse_args(argv)
+
+    predictor, meta = load_predictor()
+    print(f"Model {meta['key']} (test R² {meta['test_r2']:.4f})", file=sys.stderr)
+    rules = None
+    if not args.no_quality_checks:
+        from core.data_loader import load_dataset
+        from core.data_quality import QualityRules
+
+        rules = QualityRules.from_frame(load_dataset()[0])
+
+    def progress(rows, seconds):
+        print(f"\r{rows:,} rows · {rows / max(seconds, 1e-9):,.0f} rows/s", end="", file=sys.stderr)
+
+    stats = score_csv(args.input, args.output, predictor, meta["reference_year"],
+                      args.chunk_rows, progress, args.explain, rules)
+    print(f"\nScored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,} rows/s) -> {args.output}", file=sys.stderr)
+    if "quality" in stats and stats["quality"].rejected:
+        print(f"{stats['quality'].rejected:,} rows failed the data-quality checks "
+              f"and were not priced ({REJECTED_COLUMN} column)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
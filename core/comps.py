@@ -0,0 +1,129 @@
+# core/comps.py
+# Spatial index over the sales for comparable-sales ("comps") lookup.
+#
+#   python -m core.comps neighbourhood.csv [--k 15]
+import argparse
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+# Projection origin, roughly the middle of King County
+ORIGIN_LAT, ORIGIN_LON = 47.5, -122.2
+DEFAULT_K = 10
+NEIGHBOURHOOD_K = 15
+COMP_COLUMNS = [
+    "id", "date", "price", "bedrooms", "bathrooms", "sqft_living", "sqft_lot",
+    "grade", "zipcode", "lat", "long",
+]
+
+
+def project(lat, lon) -> np.ndarray:
+    """
+    (n, 2) planar coordinates in km (local equirectangular projection).
+
+    Over a county-sized area the distortion is well below a percent, so
+    Euclidean distances here are distances on the ground.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    x = EARTH_RADIUS_KM * (lon - np.radians(ORIGIN_LON)) * np.cos(np.radians(ORIGIN_LAT))
+    y = EARTH_RADIUS_KM * (lat - np.radians(ORIGIN_LAT))
+    return np.column_stack([np.atleast_1d(x), np.atleast_1d(y)])
+
+
+class CompsIndex:
+    """
+    KD-tree over the projected sale locations, built once per dataset version.
+
+    `query` returns the k nearest sales to a point, optionally within a
+    radius and matching grade / bedrooms within a tolerance. Attribute
+    filters are applied to growing batches of nearest candidates, so a
+    lookup only visits the part of the tree it needs.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        # Deferred: scikit-learn costs ~1 s to import and only the index needs it
+        from sklearn.neighbors import KDTree
+
+        self.sales = df[[c for c in COMP_COLUMNS if c in df.columns]]
+        self.tree = KDTree(project(df["lat"], df["long"]))
+        self._grade = df["grade"].to_numpy()
+        self._bedrooms = df["bedrooms"].to_numpy()
+
+    def __len__(self):
+        return len(self.sales)
+
+    def _matches(self, idx, grade, grade_tolerance, bedrooms, bedrooms_tolerance):
+        keep = np.ones(len(idx), dtype=bool)
+        if grade is not None:
+            keep &= np.abs(self._grade[idx] - grade) <= grade_tolerance
+        if bedrooms is not None:
+            keep &= np.abs(self._bedrooms[idx] - bedrooms) <= bedrooms_tolerance
+        return keep
+
+    def query(self, lat, lon, k=DEFAULT_K, radius_km=None, grade=None, grade_tolerance=0,
+              bedrooms=None, bedrooms_tolerance=0) -> pd.DataFrame:
+        """The `k` nearest matching sales, closest first, with a distance_km column."""
+        point = project(lat, lon)
+        n = len(self)
+        if radius_km is not None:
+            idx, dist = self.tree.query_radius(point, r=radius_km, return_distance=True, sort_results=True)
+            idx, dist = idx[0], dist[0]
+            keep = self._matches(idx, grade, grade_tolerance, bedrooms, bedrooms_tolerance)
+            idx, dist = idx[keep][:k], dist[keep][:k]
+        else:
+            # Widen the candidate set until enough of it passes the filters
+            want = min(k, n)
+            candidates = min(n, 4 * k)
+            while True:
+                dist, idx = self.tree.query(point, k=candidates)
+                dist, idx = dist[0], idx[0]
+                keep = self._matches(idx, grade, grade_tolerance, bedrooms, bedrooms_tolerance)
+                if keep.sum() >= want or candidates == n:
+                    break
+                candidates = min(n, candidates * 4)
+            idx, dist = idx[keep][:k], dist[keep][:k]
+
+        comps = self.sales.iloc[idx].reset_index(drop=True)
+        return comps.assign(distance_km=dist.round(3))
+
+    def neighbourhood_features(self, k=NEIGHBOURHOOD_K) -> pd.DataFrame:
+        """
+        Per-sale aggregates over its `k` nearest other sales, for the whole
+        dataset in one batched tree query (cf. sqft_living15 / sqft_lot15).
+        """
+        n = len(self)
+        k = min(k, n - 1)
+        dist, idx = self.tree.query(self.tree.data, k=k + 1)
+        # Drop each sale itself; where a co-located sale displaced it, drop the farthest
+        is_self = idx == np.arange(n)[:, None]
+        is_self[~is_self.any(axis=1), -1] = True
+        idx = idx[~is_self].reshape(n, k)
+        dist = dist[~is_self].reshape(n, k)
+
+        price = self.sales["price"].to_numpy(dtype=np.float64)[idx]
+        return pd.DataFrame({
+            f"nbr{k}_median_price": np.median(price, axis=1),
+            f"nbr{k}_mean_sqft_living": self.sales["sqft_living"].to_numpy(dtype=np.float64)[idx].mean(axis=1),
+            f"nbr{k}_mean_sqft_lot": self.sales["sqft_lot"].to_numpy(dtype=np.float64)[idx].mean(axis=1),
+            f"nbr{k}_mean_distance_km": dist.mean(axis=1),
+        }, index=self.sales.index)
+
+
+def main(argv=None):
+    from core.data_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Recompute neighbourhood features for every sale.")
+    parser.add_argument("output", help="where to write the CSV (id + nbr* columns)")
+    parser.add_argument("--k", type=int, default=NEIGHBOURHOOD_K)
+    args = parser.parse_args(argv)
+
+    df, _ = load_dataset()
+    features = CompsIndex(df).neighbourhood_features(args.k)
+    pd.concat([df["id"], features], axis=1).to_csv(args.output, index=False)
+    print(f"Wrote {len(features):,} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
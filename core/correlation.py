@@ -0,0 +1,148 @@
+# core/correlation.py
+# Streaming Pearson correlations from mergeable co-moment accumulators.
+#
+#   python -m core.correlation houses.csv [--chunk-rows 100000] [--workers 4]
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.schema import STORAGE_DTYPES
+
+CHUNK_ROWS = 100_000
+# Measured dataset columns; the id and derived helper columns (age_of_house
+# mirrors yr_built, month comes from date, ...) are left out of the heatmaps
+CORRELATION_COLUMNS = [c for c, dtype in STORAGE_DTYPES.items() if dtype != "category" and c != "id"]
+
+
+class CorrelationState:
+    """
+    Pairwise co-moments of a set of numeric columns, kept as p x p matrices.
+
+    For each pair (i, j), over the rows where both are present: the row
+    count, the mean and sum of squared deviations of column i, and the
+    co-moment sum((x_i - mean_i)(x_j - mean_j)). This is exactly what
+    DataFrame.corr() uses (pairwise deletion of missing values), but it can
+    be built chunk by chunk and states over disjoint rows combine with the
+    pairwise update of Chan et al., so appending rows or merging chunks
+    computed in parallel never revisits old data. Any subset of columns is
+    read off the same state.
+    """
+
+    def __init__(self, columns, n, mean, m2, comoment):
+        self.columns = list(columns)
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.comoment = comoment
+
+    @classmethod
+    def empty(cls, columns=CORRELATION_COLUMNS) -> 'CorrelationState':
+        p = len(columns)
+        return cls(columns, *(np.zeros((p, p)) for _ in range(4)))
+
+    @classmethod
+    def from_chunk(cls, chunk: pd.DataFrame, columns=CORRELATION_COLUMNS) -> 'CorrelationState':
+        """State of one chunk, with matrix products over its shifted values."""
+        # Absent columns count as missing, so every chunk's state has the same shape
+        X = chunk.reindex(columns=columns).to_numpy(dtype=np.float64)
+        present = ~np.isnan(X)
+        # Shift by the column means so the sums below do not cancel
+        counts = present.sum(axis=0)
+        shift = np.divide(np.where(present, X, 0).sum(axis=0), counts,
+                          out=np.zeros(len(columns)), where=counts > 0)
+        Z = np.where(present, X - shift, 0.0)
+        P = present.astype(np.float64)
+
+        n = P.T @ P
+        s = Z.T @ P              # sum of z_i over rows where i and j are present
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_z = np.where(n > 0, s / n, 0.0)
+        m2 = (Z * Z).T @ P - s * mean_z
+        comoment = Z.T @ Z - s * mean_z.T
+        return cls(columns, n, mean_z + shift[:, None], m2, comoment)
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=CORRELATION_COLUMNS, max_workers=1) -> 'CorrelationState':
+        """
+        One streaming pass over `chunks`. With `max_workers` > 1, chunk
+        states are computed in threads (the matrix products release the GIL)
+        and merged as they complete.
+        """
+        state = cls.empty(columns)
+        if max_workers <= 1:
+            for chunk in chunks:
+                state.merge(cls.from_chunk(chunk, columns))
+            return state
+        with ThreadPoolExecutor(max_workers) as pool:
+            # At most 2 x max_workers chunks in flight, so memory stays bounded
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(cls.from_chunk, chunk, columns))
+                if len(pending) >= 2 * max_workers:
+                    state.merge(pending.popleft().result())
+            for future in pending:
+                state.merge(future.result())
+        return state
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=CORRELATION_COLUMNS, chunk_rows=CHUNK_ROWS):
+        return cls.from_chunks(
+            (df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)), columns
+        )
+
+    def append(self, rows: pd.DataFrame) -> 'CorrelationState':
+        """Fold new rows in, in time proportional to the new rows only."""
+        return self.merge(CorrelationState.from_chunk(rows, self.columns))
+
+    def merge(self, other: 'CorrelationState') -> 'CorrelationState':
+        """Combine with the state of disjoint rows (same columns), in place."""
+        if other.columns != self.columns:
+            raise ValueError("Correlation states cover different columns")
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(n > 0, na * nb / n, 0.0)
+            share = np.where(n > 0, nb / n, 0.0)
+        # delta[i, j]: shift in the mean of column i over the (i, j) rows
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + other.m2 + delta * delta * weight
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.n = n
+        return self
+
+    def corr(self, columns=None) -> pd.DataFrame:
+        """Pearson correlation matrix of `columns` (default: all), as DataFrame.corr() returns it."""
+        columns = list(columns) if columns is not None else self.columns
+        idx = [self.columns.index(c) for c in columns]
+        sub = np.ix_(idx, idx)
+        m2, comoment = self.m2[sub], self.comoment[sub]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = comoment / np.sqrt(m2 * m2.T)
+        corr[self.n[sub] < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=columns, columns=columns)
+
+
+def main(argv=None):
+    from core.data_loader import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Correlation matrix of a CSV in one streaming pass.")
+    parser.add_argument("input", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--columns", nargs="+", default=CORRELATION_COLUMNS)
+    args = parser.parse_args(argv)
+
+    state = CorrelationState.from_chunks(
+        pd.read_csv(args.input, chunksize=args.chunk_rows, usecols=lambda c: c in args.columns),
+        args.columns, args.workers,
+    )
+    with pd.option_context("display.width", 250, "display.max_columns", None):
+        print(state.corr().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
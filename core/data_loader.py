@@ -0,0 +1,80 @@
+# core/data_loader.py
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from core.schema import SCHEMA_VERSION, apply_schema
+
+DATA_PATH = Path("data/kc_house_data.csv")
+CACHE_DIR = Path("data/.cache")
+
+# Explicit parse dtypes so the CSV is never type-sniffed (id, floors and zipcode
+# are quoted); core.schema then narrows them for storage
+CSV_DTYPES = {
+    "id": "int64",
+    "price": "float64",
+    "bedrooms": "int64",
+    "bathrooms": "float64",
+    "sqft_living": "int64",
+    "sqft_lot": "int64",
+    "floors": "float64",
+    "waterfront": "int64",
+    "view": "int64",
+    "condition": "int64",
+    "grade": "int64",
+    "sqft_above": "int64",
+    "sqft_basement": "int64",
+    "yr_built": "int64",
+    "yr_renovated": "int64",
+    "zipcode": "int64",
+    "lat": "float64",
+    "long": "float64",
+    "sqft_living15": "int64",
+    "sqft_lot15": "int64",
+}
+
+
+def file_fingerprint(path=DATA_PATH, chunk_size=1 << 20) -> str:
+    """SHA-256 of the source file, used as the dataset version."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_csv(path=DATA_PATH) -> pd.DataFrame:
+    """Parse the raw CSV with explicit dtypes and convert it to the compact schema."""
+    return apply_schema(pd.read_csv(path, dtype=CSV_DTYPES))
+
+
+def cache_path(fingerprint: str, path=DATA_PATH) -> Path:
+    return CACHE_DIR / f"{Path(path).stem}-{fingerprint[:16]}-v{SCHEMA_VERSION}.arrow"
+
+
+def load_dataset(path=DATA_PATH, fingerprint=None) -> tuple[pd.DataFrame, str]:
+    """
+    Return (frame, fingerprint).
+
+    The first call for a given file content parses the CSV and writes an
+    uncompressed Arrow IPC file next to it; later calls memory-map that file
+    instead of parsing again. Editing the CSV changes the hash and therefore
+    the cache file.
+    """
+    fingerprint = fingerprint or file_fingerprint(path)
+    cached = cache_path(fingerprint, path)
+
+    if cached.exists():
+        with pa.memory_map(str(cached), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(), fingerprint
+
+    df = parse_csv(path)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(".tmp")
+    feather.write_feather(df, tmp, compression="uncompressed")
+    tmp.replace(cached)
+    return df, fingerprint
@@ -0,0 +1,306 @@
+# core/data_quality.py
+# Vectorized, chunkable data-quality checks for the dataset and for new data.
+#
+#   python -m core.data_quality [houses.csv] [--chunk-rows 100000]
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from core.schema import VALUE_RANGES
+
+CHUNK_ROWS = 100_000
+SEVERITIES = ("error", "warning", "info")
+# Tukey fences: outside [Q1 - k IQR, Q3 + k IQR]
+IQR_K = 1.5
+# Modified z-score cut-off, |0.6745 (x - median) / MAD| (Iglewicz & Hoaglin)
+MAD_Z = 3.5
+# Continuous measures screened for statistical outliers
+OUTLIER_COLUMNS = [
+    "price", "bedrooms", "bathrooms", "sqft_living", "sqft_lot", "sqft_above",
+    "sqft_basement", "sqft_living15", "sqft_lot15",
+]
+# Fewer square feet of living area per bedroom than this is implausible
+MIN_SQFT_PER_BEDROOM = 150
+# Rows kept as examples per finding
+EXAMPLES = 5
+
+
+def _numeric(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _fmt(value) -> str:
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:g}"
+
+
+def _dates(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, format="mixed", errors="coerce")
+
+
+def sale_keys(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of (id, sale date) per row, independent of how either was parsed."""
+    keys = pd.DataFrame({
+        "id": pd.to_numeric(df["id"], errors="coerce"),
+        "date": _dates(df["date"]).astype("datetime64[ns]"),
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class QualityRules:
+    """
+    Thresholds the checks compare against, fitted once on a reference dataset.
+
+    `fences` holds per-column quartiles, Tukey fences, median and MAD for
+    OUTLIER_COLUMNS; `sale_keys` are the (id, date) hashes already in the
+    reference, so new data repeating one of its sales can be rejected;
+    `zipcodes` are the reference's zipcodes, the levels the price model is
+    trained on (any other zipcode would be priced as the baseline one).
+    """
+
+    def __init__(self, fences: pd.DataFrame, sale_keys=None, value_ranges=VALUE_RANGES, zipcodes=None):
+        self.fences = fences
+        self.sale_keys = np.sort(sale_keys) if sale_keys is not None else np.empty(0, dtype=np.uint64)
+        self.value_ranges = value_ranges
+        self.zipcodes = zipcodes
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=OUTLIER_COLUMNS, k=IQR_K):
+        columns = [c for c in columns if c in df.columns]
+        values = np.column_stack([_numeric(df[c]) for c in columns])
+        q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+        mad = np.nanmedian(np.abs(values - median), axis=0)
+        iqr = q3 - q1
+        fences = pd.DataFrame({
+            "q1": q1, "q3": q3, "low": q1 - k * iqr, "high": q3 + k * iqr,
+            "median": median, "mad": mad,
+        }, index=columns)
+        keys = sale_keys(df) if {"id", "date"} <= set(df.columns) else None
+        zipcodes = None
+        if "zipcode" in df.columns:
+            zipcodes = np.unique(_numeric(df["zipcode"]))
+            zipcodes = zipcodes[~np.isnan(zipcodes)]
+        return cls(fences, keys, zipcodes=zipcodes)
+
+
+class QualityReport:
+    """
+    Findings accumulated over one or more chunks.
+
+    One entry per (check, column): severity, affected rows, a description
+    and the ids (or row numbers) of the first few affected rows.
+    `rejected` counts rows with at least one error-level finding.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected = 0
+        self.findings = {}
+
+    def add(self, check, column, severity, description, mask, labels):
+        n = int(mask.sum())
+        if not n:
+            return
+        entry = self.findings.setdefault(
+            (check, column), {"severity": severity, "description": description, "rows": 0, "examples": []}
+        )
+        entry["rows"] += n
+        room = EXAMPLES - len(entry["examples"])
+        if room > 0:
+            entry["examples"] += [v.item() if hasattr(v, "item") else v for v in labels[mask][:room]]
+
+    @property
+    def ok(self) -> bool:
+        return self.rejected == 0
+
+    def count(self, check, column=None) -> int:
+        return sum(e["rows"] for (c, col), e in self.findings.items()
+                   if c == check and (column is None or col == column))
+
+    def table(self, severities=SEVERITIES) -> pd.DataFrame:
+        """Findings as a frame, errors first then by rows affected."""
+        columns = ["severity", "check", "column", "rows", "share", "description", "examples"]
+        records = [
+            {"severity": e["severity"], "check": check, "column": column, "rows": e["rows"],
+             "share": e["rows"] / self.rows if self.rows else 0.0,
+             "description": e["description"], "examples": ", ".join(map(str, e["examples"]))}
+            for (check, column), e in self.findings.items() if e["severity"] in severities
+        ]
+        table = pd.DataFrame(records, columns=columns)
+        rank = table["severity"].map({s: i for i, s in enumerate(SEVERITIES)})
+        return (table.assign(_rank=rank).sort_values(["_rank", "rows"], ascending=[True, False])
+                .drop(columns="_rank").reset_index(drop=True))
+
+
+class QualityChecker:
+    """
+    Runs every check on chunk after chunk, accumulating a QualityReport.
+
+    Checks: missing values (errors in `required` columns, warnings
+    elsewhere), duplicate sales (id + date, within the data or already in
+    the reference) and repeat sales of one id, VALUE_RANGES domains,
+    zipcodes outside the reference, IQR and MAD outliers against `rules`,
+    and cross-column consistency
+    (sqft_above + sqft_basement = sqft_living, renovation after
+    construction, living area per bedroom, sale before construction).
+    Each check is a vectorized mask over the chunk; `check` returns the
+    rows with an error-level finding, which is what gates new data.
+    """
+
+    def __init__(self, rules: QualityRules = None, required=(), check_reference=False):
+        self.rules = rules
+        self.required = list(required)
+        self.check_reference = check_reference
+        self.report = QualityReport()
+        self._sale_keys = np.empty(0, dtype=np.uint64)
+        self._ids = np.empty(0, dtype=np.float64)
+
+    def check(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Check one chunk; returns its boolean mask of rejected (error) rows."""
+        chunk = chunk.rename(columns=lambda c: str(c).strip().lower())
+        n = len(chunk)
+        # Findings cite ids where there are any, 1-based row numbers otherwise
+        if "id" in chunk.columns:
+            labels = chunk["id"].to_numpy()
+        else:
+            labels = np.arange(self.report.rows + 1, self.report.rows + n + 1)
+        rejected = np.zeros(n, dtype=bool)
+
+        def add(check, column, severity, description, mask):
+            nonlocal rejected
+            self.report.add(check, column, severity, description, mask, labels)
+            if severity == "error":
+                rejected |= mask
+
+        values = {c: _numeric(chunk[c]) for c in chunk.columns if c in VALUE_RANGES}
+        self._missing(chunk, values, n, add)
+        self._duplicates(chunk, add)
+        self._ranges(values, add)
+        self._zipcodes(chunk, add)
+        self._outliers(values, add)
+        self._consistency(chunk, values, add)
+
+        self.report.rows += n
+        self.report.rejected += int(rejected.sum())
+        return rejected
+
+    def _missing(self, chunk, values, n, add):
+        for column in self.required:
+            if column not in chunk.columns:
+                add("missing_column", column, "error", "Required column is absent", np.ones(n, dtype=bool))
+        for column in chunk.columns:
+            missing = np.isnan(values[column]) if column in values else chunk[column].isna().to_numpy()
+            required = column in self.required
+            add("missing", column, "error" if required else "warning",
+                "Missing or non-numeric value" + (" in a model input" if required else ""), missing)
+
+    def _duplicates(self, chunk, add):
+        if not {"id", "date"} <= set(chunk.columns):
+            return
+        keys = sale_keys(chunk)
+        seen = np.isin(keys, self._sale_keys) | pd.Series(keys).duplicated().to_numpy()
+        add("duplicate_sale", "id", "error", "Same id sold on the same date more than once", seen)
+        if self.check_reference and self.rules is not None:
+            add("already_in_dataset", "id", "error", "Sale (id + date) is already in the dataset",
+                np.isin(keys, self.rules.sale_keys))
+        self._sale_keys = np.union1d(self._sale_keys, keys)
+
+        # Resales: an id seen before under another date (expected, reported for context)
+        ids = _numeric(chunk["id"])
+        repeat = (np.isin(ids, self._ids) | pd.Series(ids).duplicated().to_numpy()) & ~seen
+        add("repeat_sale", "id", "info", "House sold more than once (another sale date)", repeat)
+        self._ids = np.union1d(self._ids, ids)
+
+    def _ranges(self, values, add):
+        for column, x in values.items():
+            lo, hi = (self.rules.value_ranges if self.rules is not None else VALUE_RANGES)[column]
+            add("out_of_range", column, "error", f"Outside the documented domain [{lo:g}, {hi:g}]",
+                (x < lo) | (x > hi))
+
+    def _zipcodes(self, chunk, add):
+        if self.rules is None or self.rules.zipcodes is None or "zipcode" not in chunk.columns:
+            return
+        # Non-numeric zipcodes count as unknown; truly missing ones are reported by _missing
+        unknown = ~np.isin(_numeric(chunk["zipcode"]), self.rules.zipcodes) & chunk["zipcode"].notna().to_numpy()
+        add("unknown_zipcode", "zipcode", "error",
+            "Zipcode not in the dataset, the model would price it as the baseline zipcode", unknown)
+
+    def _outliers(self, values, add):
+        if self.rules is None:
+            return
+        for column, f in self.rules.fences.iterrows():
+            if column not in values:
+                continue
+            x = values[column]
+            add("iqr_outlier", column, "info",
+                f"Outside the Tukey fences [{_fmt(f['low'])}, {_fmt(f['high'])}] (k = {IQR_K:g})",
+                (x < f["low"]) | (x > f["high"]))
+            if f["mad"] > 0:
+                z = 0.6745 * np.abs(x - f["median"]) / f["mad"]
+                add("mad_outlier", column, "info", f"Modified z-score above {MAD_Z:g} (median {_fmt(f['median'])})",
+                    z > MAD_Z)
+
+    def _consistency(self, chunk, values, add):
+        if {"sqft_above", "sqft_basement", "sqft_living"} <= values.keys():
+            gap = values["sqft_above"] + values["sqft_basement"] - values["sqft_living"]
+            add("sqft_mismatch", "sqft_living", "error", "sqft_above + sqft_basement ≠ sqft_living",
+                np.abs(gap) > 0.5)
+        if {"yr_renovated", "yr_built"} <= values.keys():
+            renovated = values["yr_renovated"]
+            add("renovated_before_built", "yr_renovated", "error", "Renovated before it was built",
+                (renovated > 0) & (renovated < values["yr_built"]))
+        if {"sqft_living", "bedrooms"} <= values.keys():
+            bedrooms = values["bedrooms"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cramped = (bedrooms > 0) & (values["sqft_living"] / bedrooms < MIN_SQFT_PER_BEDROOM)
+            add("cramped_bedrooms", "bedrooms", "warning",
+                f"Less than {MIN_SQFT_PER_BEDROOM} sqft of living area per bedroom", cramped)
+        if "yr_built" in values and "date" in chunk.columns:
+            sale_year = _dates(chunk["date"]).dt.year.to_numpy(dtype=np.float64)
+            add("sold_before_built", "yr_built", "info", "Sold before the year it was built (pre-construction sale)",
+                values["yr_built"] > sale_year)
+
+
+def check_frame(df: pd.DataFrame, rules: QualityRules = None, required=(), chunk_rows=CHUNK_ROWS) -> QualityReport:
+    """Report for an in-memory frame, checked in chunks; rules default to fences fitted on `df` itself."""
+    checker = QualityChecker(rules if rules is not None else QualityRules.from_frame(df), required)
+    for i in range(0, len(df), chunk_rows):
+        checker.check(df.iloc[i:i + chunk_rows])
+    return checker.report
+
+
+def gate(df: pd.DataFrame, rules: QualityRules, required=()) -> tuple[pd.DataFrame, QualityReport]:
+    """
+    (accepted rows, report) for new data about to reach a model: rows with
+    any error-level finding, including sales already in the reference
+    dataset, are dropped.
+    """
+    checker = QualityChecker(rules, required, check_reference=True)
+    rejected = checker.check(df)
+    return df[~rejected], checker.report
+
+
+def main(argv=None):
+    from core.data_loader import DATA_PATH, load_dataset
+
+    parser = argparse.ArgumentParser(description="Run the data-quality checks over a CSV in chunks.")
+    parser.add_argument("input", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    # Outlier fences come from the project dataset, so new files are judged against it
+    reference, _ = load_dataset()
+    checker = QualityChecker(QualityRules.from_frame(reference))
+    for chunk in pd.read_csv(args.input, chunksize=args.chunk_rows):
+        checker.check(chunk)
+    report = checker.report
+    print(f"{report.rows:,} rows checked, {report.rejected:,} with errors")
+    with pd.option_context("display.width", 200, "display.max_colwidth", 60):
+        print(report.table().drop(columns="examples").to_string(index=False))
+    raise SystemExit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
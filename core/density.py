@@ -0,0 +1,66 @@
+# core/density.py
+# Server-side 2D binning so large scatters ship a grid instead of every row.
+import os
+
+import numpy as np
+import pandas as pd
+
+# Above this many rows in view, scatters switch to binned density mode
+DENSITY_ROW_THRESHOLD = int(os.environ.get("KC_DENSITY_ROW_THRESHOLD", 50_000))
+DEFAULT_BINS = 200
+
+
+def use_density(n_rows: int, threshold: int = DENSITY_ROW_THRESHOLD) -> bool:
+    return n_rows > threshold
+
+
+def region_mask(x, y, x_range=None, y_range=None) -> np.ndarray:
+    """Rows whose (x, y) fall inside the given inclusive ranges."""
+    mask = np.ones(len(x), dtype=bool)
+    if x_range is not None:
+        mask &= (x >= x_range[0]) & (x <= x_range[1])
+    if y_range is not None:
+        mask &= (y >= y_range[0]) & (y <= y_range[1])
+    return mask
+
+
+def density_grid(x, y, values=None, bins=DEFAULT_BINS, x_range=None, y_range=None) -> dict:
+    """
+    Bin points into a bins x bins grid.
+
+    Returns counts (and the per-cell mean of `values`, if given) with shape
+    (y_bins, x_bins), i.e. ready for a heatmap's z, plus the bin centers.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ranges = [
+        x_range or (x.min(), x.max()),
+        y_range or (y.min(), y.max()),
+    ]
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=ranges)
+    grid = {
+        "count": counts.T,
+        "x": (x_edges[:-1] + x_edges[1:]) / 2,
+        "y": (y_edges[:-1] + y_edges[1:]) / 2,
+    }
+    if values is not None:
+        sums, _, _ = np.histogram2d(
+            x, y, bins=[x_edges, y_edges], weights=np.asarray(values, dtype=np.float64)
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid["mean"] = (sums / counts).T
+    return grid
+
+
+def density_cells(x, y, values=None, bins=DEFAULT_BINS, x_range=None, y_range=None) -> pd.DataFrame:
+    """Non-empty cells of density_grid as rows of (x, y, count[, mean])."""
+    grid = density_grid(x, y, values, bins, x_range, y_range)
+    iy, ix = np.nonzero(grid["count"])
+    cells = pd.DataFrame({
+        "x": grid["x"][ix],
+        "y": grid["y"][iy],
+        "count": grid["count"][iy, ix].astype(np.int64),
+    })
+    if values is not None:
+        cells["mean"] = grid["mean"][iy, ix]
+    return cells
@@ -0,0 +1,236 @@
+# core/engines.py
+# Pluggable price-model engines, trained and compared on shared CV folds.
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer, TransformedTargetRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import KFold, train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from core import model_registry, ridge_model
+from core.compiled_predictor import compile_model
+from core.ridge_model import CATEGORICAL_FEATURE, INPUT_FEATURES, NUMERIC_FEATURES, TARGET, model_frame
+
+DEFAULT_ENGINE = ridge_model.ENGINE
+COMPARISON_FOLDS = 5
+# Rows timed one at a time when measuring single-row predict latency
+LATENCY_ROWS = 200
+
+
+class EstimatorPredictor:
+    """Serving wrapper giving a fitted sklearn estimator the CompiledPredictor interface."""
+
+    def __init__(self, model):
+        self.model = model
+        self.numeric = list(NUMERIC_FEATURES)
+        self.categorical = CATEGORICAL_FEATURE
+
+    def predict_one(self, row: dict) -> float:
+        return float(self.predict(pd.DataFrame([row], columns=INPUT_FEATURES))[0])
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.model.predict(df[INPUT_FEATURES])
+
+    def predict_arrays(self, X: np.ndarray, zips) -> np.ndarray:
+        df = pd.DataFrame(X, columns=self.numeric)
+        df[self.categorical] = np.asarray(zips)
+        return self.predict(df)
+
+
+class Engine:
+    """
+    One way of turning the model inputs into a price.
+
+    Subclasses set `name` (registry name), `label`, `version` and
+    `defaults`, and implement `build(params)` returning an unfitted model
+    with fit(X, y) / predict(X) over `model_frame` columns. Everything else
+    (registry keys, train/test scoring, serving) is shared.
+    """
+
+    name = ""
+    label = ""
+    version = 1
+    defaults = {}
+
+    def full_params(self, params=None) -> dict:
+        return {
+            "test_size": ridge_model.DEFAULT_PARAMS["test_size"],
+            "random_state": ridge_model.DEFAULT_PARAMS["random_state"],
+            **self.defaults, **(params or {}), "engine_version": self.version,
+        }
+
+    def artifact_key(self, data_fingerprint: str, params=None) -> str:
+        return model_registry.artifact_key(data_fingerprint, self.name, self.full_params(params))
+
+    def build(self, params: dict):
+        raise NotImplementedError
+
+    def compile(self, model):
+        return EstimatorPredictor(model)
+
+    def load_or_train(self, df: pd.DataFrame, data_fingerprint: str, params=None, progress=None):
+        """Registry artifact for (data, engine, params), trained on a train/test split if missing."""
+        params = self.full_params(params)
+        report = progress or (lambda fraction, message: None)
+
+        def train():
+            X = model_frame(df)
+            y = df[TARGET].to_numpy(dtype=np.float64)
+            train_idx, test_idx = train_test_split(
+                np.arange(len(df)), test_size=params["test_size"], random_state=params["random_state"]
+            )
+            report(0.05, f"Fitting {self.label}")
+            model = self.build(params).fit(X.iloc[train_idx], y[train_idx])
+            report(0.9, "Scoring train/test split")
+            return model, {
+                "train_r2": r2_score(y[train_idx], model.predict(X.iloc[train_idx])),
+                "test_r2": r2_score(y[test_idx], model.predict(X.iloc[test_idx])),
+                "n_rows": len(df),
+                "reference_year": int(df["yr_built"].max()),
+                "input_features": INPUT_FEATURES,
+            }
+
+        return model_registry.get_or_train(data_fingerprint, self.name, params, train)
+
+
+class PolyRidgeEngine(Engine):
+    """The sparse degree-2 polynomial Ridge (core/ridge_model.py), served compiled."""
+
+    name = ridge_model.ENGINE
+    label = "Polynomial Ridge"
+    version = ridge_model.ENGINE_VERSION
+    defaults = {"alpha": ridge_model.DEFAULT_PARAMS["alpha"]}
+
+    def full_params(self, params=None) -> dict:
+        return ridge_model.full_params(params)
+
+    def build(self, params):
+        return ridge_model.PolyRidgeModel(alpha=params["alpha"])
+
+    def compile(self, model):
+        return compile_model(model)
+
+    def load_or_train(self, df, data_fingerprint, params=None, progress=None):
+        return ridge_model.load_or_train(df, data_fingerprint, params, progress)
+
+
+class HistGradientBoostingEngine(Engine):
+    """Histogram gradient boosting on log price, with zipcode as a native categorical."""
+
+    name = "hist_gbm"
+    label = "Gradient Boosting"
+    defaults = {"max_iter": 500, "learning_rate": 0.1, "max_leaf_nodes": 31}
+
+    def build(self, params):
+        encode = ColumnTransformer(
+            [("zip", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1),
+              [CATEGORICAL_FEATURE])],
+            remainder="passthrough",
+        )
+        boost = HistGradientBoostingRegressor(
+            max_iter=params["max_iter"], learning_rate=params["learning_rate"],
+            max_leaf_nodes=params["max_leaf_nodes"], categorical_features=[0],
+            random_state=params["random_state"],
+        )
+        return TransformedTargetRegressor(
+            make_pipeline(encode, boost), func=np.log, inverse_func=np.exp
+        )
+
+
+class LinearBaselineEngine(Engine):
+    """Standardized numeric inputs plus one-hot zipcodes, no interactions."""
+
+    name = "linear"
+    label = "Linear Baseline"
+    defaults = {"alpha": 1.0}
+
+    def build(self, params):
+        encode = ColumnTransformer([
+            ("num", StandardScaler(), NUMERIC_FEATURES),
+            ("zip", OneHotEncoder(handle_unknown="ignore"), [CATEGORICAL_FEATURE]),
+        ])
+        return make_pipeline(encode, Ridge(alpha=params["alpha"]))
+
+
+ENGINES = {
+    engine.name: engine
+    for engine in (PolyRidgeEngine(), HistGradientBoostingEngine(), LinearBaselineEngine())
+}
+
+
+def get_engine(name: str) -> Engine:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown model engine {name!r}; choose from {', '.join(ENGINES)}") from None
+
+
+def _cross_validate_engine(args):
+    """Worker: fit one engine on every shared fold and measure its serving cost."""
+    name, df, folds, params = args
+    engine = get_engine(name)
+    params = engine.full_params(params)
+    X = model_frame(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+
+    r2, mae, fit_seconds = [], [], []
+    for train_idx, test_idx in folds:
+        start = time.perf_counter()
+        model = engine.build(params).fit(X.iloc[train_idx], y[train_idx])
+        fit_seconds.append(time.perf_counter() - start)
+        pred = model.predict(X.iloc[test_idx])
+        r2.append(r2_score(y[test_idx], pred))
+        mae.append(mean_absolute_error(y[test_idx], pred))
+
+    # Serving cost of the last fold's model, through the same path the form uses
+    predictor = engine.compile(model)
+    rows = X.iloc[test_idx[:LATENCY_ROWS]].to_dict("records")
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        predictor.predict_one(row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "engine": name,
+        "label": engine.label,
+        "cv_r2": float(np.mean(r2)),
+        "cv_r2_std": float(np.std(r2)),
+        "cv_mae": float(np.mean(mae)),
+        "fit_seconds": float(np.mean(fit_seconds)),
+        "predict_us": float(np.median(timings) * 1e6),
+        "model_kb": len(pickle.dumps(model)) / 1024,
+        "serving_kb": len(pickle.dumps(predictor)) / 1024,
+    }
+
+
+def compare_engines(df: pd.DataFrame, names=None, params=None, n_folds=COMPARISON_FOLDS,
+                    random_state=42, max_workers=None) -> pd.DataFrame:
+    """
+    Cross-validate every engine in `names` on the same k folds.
+
+    Each engine runs in its own worker process. `params` maps engine name
+    to hyperparameter overrides. Returns one row per engine: mean/std R²,
+    MAE, mean fit seconds, median single-row predict µs and the pickled
+    sizes of the stored model and of its serving form.
+    """
+    names = list(names or ENGINES)
+    params = params or {}
+    folds = list(KFold(n_folds, shuffle=True, random_state=random_state).split(df))
+    jobs = [(name, df, folds, params.get(name)) for name in names]
+
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_cross_validate_engine, jobs))
+    else:
+        results = [_cross_validate_engine(job) for job in jobs]
+    return pd.DataFrame(results)
@@ -0,0 +1,45 @@
+# core/features.py
+# Derived columns shared by the dashboard tabs and the price model.
+import numpy as np
+import pandas as pd
+
+LOT_SIZE_BINS = [0, 2000, 4000, 6000, 10000, 20000]
+LOT_SIZE_LABELS = ['<2k', '2k–4k', '4k–6k', '6k–10k', '10k–20k', '20k+']
+
+YES_NO = pd.CategoricalDtype(['No', 'Yes'])
+
+
+def _yes_no(mask) -> pd.Categorical:
+    return pd.Categorical.from_codes(np.asarray(mask, dtype=np.int8), dtype=YES_NO)
+
+
+def _age_of_house(df):
+    yr_built = df['yr_built'].to_numpy()
+    return (yr_built.max() - yr_built).astype(np.int16)
+
+
+def _lot_size_range(df):
+    sqft_lot = df['sqft_lot'].to_numpy()
+    bins = LOT_SIZE_BINS + [max(sqft_lot.max(), LOT_SIZE_BINS[-1] + 1)]
+    return pd.cut(sqft_lot, bins=bins, labels=LOT_SIZE_LABELS)
+
+
+# name -> vectorized function of the base frame
+FEATURES = {
+    'age_of_house': _age_of_house,
+    'was_renovated': lambda df: _yes_no(df['yr_renovated'].to_numpy() > 0),
+    'waterfront_label': lambda df: _yes_no(df['waterfront'].to_numpy() == 1),
+    'floors_rounded': lambda df: np.ceil(df['floors'].to_numpy()).astype(np.int8),
+    'month': lambda df: df['date'].dt.month.to_numpy(dtype=np.int8),
+    'lot_size_range': _lot_size_range,
+}
+
+
+def compute_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame of every column in FEATURES, aligned to `df.index`.
+
+    Callers that need it once per dataset version go through
+    core.app_data, which caches the result per fingerprint.
+    """
+    return pd.DataFrame({name: fn(df) for name, fn in FEATURES.items()}, index=df.index)
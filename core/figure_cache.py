@@ -0,0 +1,169 @@
+# core/figure_cache.py
+# LRU cache of built Plotly figures, with payload compaction.
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly
+import plotly.io as pio
+
+FIGURE_CACHE_MB = float(os.environ.get("KC_FIGURE_CACHE_MB", 64))
+# Float arrays are rounded to this many significant digits (about float32)
+SIGNIFICANT_DIGITS = 7
+# Trace properties that hold data arrays
+ARRAY_PROPERTIES = ("x", "y", "z", "lat", "lon", "text", "customdata")
+MARKER_ARRAYS = ("color", "size")
+# Plotly >= 6 ships numpy arrays to the browser base64-encoded, so narrow
+# dtypes shrink the payload directly; older versions write JSON number lists
+BINARY_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+
+
+def compact_array(values):
+    """
+    Smallest faithful representation of a numeric array for the browser.
+
+    Integral floats become the narrowest integer dtype; other floats are
+    rounded to SIGNIFICANT_DIGITS (and stored as float32 when arrays are
+    binary-encoded, so JSON never carries 17-digit reprs). Anything that is
+    not numeric is returned unchanged.
+    """
+    original = values
+    if isinstance(values, (list, tuple)):
+        values = np.asarray(values)
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "fiu" or values.size == 0:
+        return original
+    finite = values[np.isfinite(values)] if values.dtype.kind == "f" else values
+    if finite.size == 0:
+        return original
+    if values.dtype.kind in "iu" or (finite.size == values.size and np.all(finite == np.round(finite))):
+        lo, hi = finite.min(), finite.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+        return values.astype(np.int64)
+    magnitude = np.abs(finite).max()
+    decimals = SIGNIFICANT_DIGITS - 1 - int(np.floor(np.log10(magnitude))) if magnitude > 0 else 0
+    rounded = np.round(values, max(decimals, 0))
+    return rounded.astype(np.float32) if BINARY_ARRAYS else rounded
+
+
+def compact_columns(values):
+    """compact_array applied column by column to a 2D array (e.g. hover customdata)."""
+    if not isinstance(values, np.ndarray) or values.ndim != 2 or values.dtype.kind not in "fiu":
+        return compact_array(values)
+    columns = [compact_array(values[:, i]) for i in range(values.shape[1])]
+    if all(c.dtype.kind in "iu" for c in columns):
+        return np.column_stack(columns)
+    # Mixed columns: keep each column's rounding, in one float array
+    return np.column_stack([c.astype(np.float64) for c in columns]).astype(
+        np.float32 if BINARY_ARRAYS else np.float64
+    )
+
+
+def _assign(obj, prop, value):
+    # Plotly ignores assignments equal to the current value, which an
+    # exact dtype change (e.g. float -> int) is; clear the property first
+    if value is not obj[prop]:
+        obj[prop] = None
+        obj[prop] = value
+
+
+def _drop_unused_customdata(trace):
+    """Keep only the customdata columns the hovertemplate references."""
+    data = trace.customdata
+    template = trace.hovertemplate
+    if data is None or not isinstance(template, str) or np.ndim(data) != 2:
+        return
+    if re.search(r"customdata(?!\[)", template):
+        return  # referenced as a whole (e.g. a heatmap's per-cell values)
+    used = sorted({int(i) for i in re.findall(r"customdata\[(\d+)\]", template)})
+    if len(used) == np.shape(data)[1]:
+        return
+    remap = {old: new for new, old in enumerate(used)}
+    trace.hovertemplate = re.sub(
+        r"customdata\[(\d+)\]", lambda m: f"customdata[{remap[int(m.group(1))]}]", template
+    )
+    trace.customdata = np.asarray(data)[:, used] if used else None
+
+
+def compact_figure(fig):
+    """Shrink `fig`'s serialized payload in place (see compact_array); returns it."""
+    for trace in fig.data:
+        if "customdata" in trace and "hovertemplate" in trace:
+            _drop_unused_customdata(trace)
+        for prop in ARRAY_PROPERTIES:
+            if prop in trace and trace[prop] is not None:
+                compact = compact_columns if prop == "customdata" else compact_array
+                _assign(trace, prop, compact(trace[prop]))
+        if "marker" in trace:
+            for prop in MARKER_ARRAYS:
+                if prop in trace.marker and trace.marker[prop] is not None:
+                    _assign(trace.marker, prop, compact_array(trace.marker[prop]))
+    return fig
+
+
+class FigureCache:
+    """
+    Process-wide LRU of compacted figures, bounded by serialized size.
+
+    Keys are (dataset fingerprint, filters key, chart id, chart params);
+    the least recently used figures are evicted once the total JSON size
+    exceeds `max_bytes`. Safe to share between sessions.
+    """
+
+    def __init__(self, max_bytes=int(FIGURE_CACHE_MB * 2 ** 20)):
+        self.max_bytes = max_bytes
+        self._figures = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key][0]
+        fig = compact_figure(build())
+        size = len(pio.to_json(fig, validate=False))
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes:
+                old = self._figures.pop(key, None)
+                self._bytes += size - (old[1] if old else 0)
+                self._figures[key] = (fig, size)
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._figures.popitem(last=False)
+                    self._bytes -= evicted
+        return fig
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"figures": len(self._figures), "mb": round(self._bytes / 2 ** 20, 2),
+                    "hits": self.hits, "misses": self.misses}
+
+
+class FigureScope:
+    """
+    A FigureCache bound to one dataset version and filter state.
+
+    Every dashboard tab takes one as `figures` and calls
+    `figures.get(chart_id, build, *params)`, where `params` are any widget
+    values the chart depends on, so a built figure is reused until the
+    dataset, the sidebar filters or those widgets change. Without a cache
+    (the default `FigureScope()` a tab falls back to) the figure is just
+    built and compacted.
+    """
+
+    def __init__(self, cache=None, fingerprint=None, filters_key=()):
+        self.cache = cache
+        self.scope = (fingerprint, filters_key)
+
+    def get(self, chart_id: str, build, *params):
+        if self.cache is None:
+            return compact_figure(build())
+        return self.cache.get((*self.scope, chart_id, params), build)
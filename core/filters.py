@@ -0,0 +1,101 @@
+# core/filters.py
+# Column indexes behind the Dashboard's global filter sidebar.
+import numpy as np
+import pandas as pd
+
+# Columns answered with a sorted index (range predicates)
+RANGE_COLUMNS = ['price', 'date']
+# Columns answered with one bitmap per level (membership predicates)
+BITMAP_COLUMNS = ['zipcode', 'grade', 'waterfront']
+
+
+class SortedIndex:
+    """Row order of a column sorted by value, for range lookups by binary search."""
+
+    def __init__(self, values: np.ndarray):
+        self.unit = None
+        if values.dtype.kind == 'M':
+            # Search datetimes as their integer ticks
+            self.unit = np.datetime_data(values.dtype)[0]
+            values = values.view(np.int64)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+
+    def _key(self, value):
+        if self.unit is None:
+            return value
+        return np.datetime64(pd.Timestamp(value), self.unit).astype(np.int64)
+
+    def rows_between(self, lo=None, hi=None) -> np.ndarray:
+        """Row positions with lo <= value <= hi (either bound may be None)."""
+        start = 0 if lo is None else np.searchsorted(self.sorted_values, self._key(lo), 'left')
+        stop = len(self.order) if hi is None else np.searchsorted(self.sorted_values, self._key(hi), 'right')
+        return self.order[start:stop]
+
+
+class BitmapIndex:
+    """One packed bitmap (n_rows / 8 bytes) per distinct value of a column."""
+
+    def __init__(self, values: pd.Series):
+        self.n_rows = len(values)
+        codes, levels = pd.factorize(values, sort=True)
+        self.bitmaps = {
+            level: np.packbits(codes == i) for i, level in enumerate(levels.tolist())
+        }
+
+    def bitmap_for(self, levels) -> np.ndarray:
+        """Packed bitmap of rows whose value is any of `levels`."""
+        out = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for level in levels:
+            bitmap = self.bitmaps.get(level)
+            if bitmap is not None:
+                np.bitwise_or(out, bitmap, out=out)
+        return out
+
+
+class FilterIndex:
+    """
+    Sorted and bitmap indexes built once per dataset version.
+
+    `mask(filters)` resolves a combined predicate by AND-ing packed bitmaps,
+    so it never scans the columns themselves. `filters` maps column name to
+    either a list of accepted values (bitmap columns) or a (lo, hi) tuple
+    (range columns); missing or None entries mean "no filter".
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_rows = len(df)
+        self.ranges = {col: SortedIndex(df[col].to_numpy()) for col in RANGE_COLUMNS if col in df.columns}
+        self.bitmaps = {col: BitmapIndex(df[col]) for col in BITMAP_COLUMNS if col in df.columns}
+
+    def _range_bitmap(self, col, lo, hi) -> np.ndarray:
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.ranges[col].rows_between(lo, hi)] = True
+        return np.packbits(mask)
+
+    def mask(self, filters: dict):
+        """Boolean row mask for `filters`, or None when nothing is filtered."""
+        packed = None
+        for col, value in filters.items():
+            if value is None:
+                continue
+            if col in self.bitmaps:
+                bitmap = self.bitmaps[col].bitmap_for(value)
+            elif col in self.ranges:
+                bitmap = self._range_bitmap(col, *value)
+            else:
+                raise KeyError(f"No index for filter column {col!r}")
+            packed = bitmap if packed is None else np.bitwise_and(packed, bitmap, out=packed)
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+
+def filters_key(filters: dict) -> tuple:
+    """Hashable, order-independent form of a filters dict (for caching)."""
+    items = []
+    for col, value in sorted(filters.items()):
+        if value is None:
+            continue
+        items.append((col, tuple(sorted(value)) if isinstance(value, (list, set)) else tuple(value)))
+    return tuple(items)
@@ -0,0 +1,131 @@
+# core/hexgrid.py
+# Multi-resolution hexagonal grid index for map aggregation.
+import numpy as np
+import pandas as pd
+
+from core.comps import ORIGIN_LAT, ORIGIN_LON, EARTH_RADIUS_KM, project
+
+# Hexagon circumradius per resolution, coarse to fine
+HEX_SIZES_KM = (8.0, 4.0, 2.0, 1.0, 0.5, 0.25)
+# Finest resolution is chosen so that a view holds at most this many cells
+MAX_CELLS = 1500
+_SQRT3 = np.sqrt(3.0)
+
+
+def hex_cells(x, y, size):
+    """Axial (q, r) of the pointy-top hexagon of circumradius `size` containing each point."""
+    qf = (_SQRT3 / 3 * x - y / 3) / size
+    rf = (2 / 3 * y) / size
+    sf = -qf - rf
+    q, r, s = np.round(qf), np.round(rf), np.round(sf)
+    # Cube rounding: fix the coordinate with the largest rounding error
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+
+def hex_centers(q, r, size):
+    """Projected (x, y) km of axial hex cells."""
+    return size * _SQRT3 * (q + r / 2), size * 1.5 * r
+
+
+def unproject(x, y):
+    """Inverse of core.comps.project: (lat, lon) in degrees."""
+    lat = ORIGIN_LAT + np.degrees(np.asarray(y) / EARTH_RADIUS_KM)
+    lon = ORIGIN_LON + np.degrees(np.asarray(x) / (EARTH_RADIUS_KM * np.cos(np.radians(ORIGIN_LAT))))
+    return lat, lon
+
+
+class HexGridIndex:
+    """
+    Every sale assigned to a hexagonal cell at each resolution in HEX_SIZES_KM.
+
+    Built once per dataset version; `aggregate(size, mask)` then reduces any
+    row subset (the sidebar filters, a zoom region) to per-cell count, mean
+    and median price, mean price per sqft and mean condition with bincounts
+    and one sort, so re-aggregating after a filter change never rebins.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        x, y = project(df["lat"], df["long"]).T
+        self.index = df.index
+        self.price = df["price"].to_numpy(dtype=np.float64)
+        self.price_per_sqft = self.price / df["sqft_living"].to_numpy(dtype=np.float64)
+        self.condition = df["condition"].to_numpy(dtype=np.float64)
+        self.codes = {}
+        self.cells = {}
+        for size in HEX_SIZES_KM:
+            q, r = hex_cells(x, y, size)
+            cells, codes = np.unique(np.column_stack([q, r]), axis=0, return_inverse=True)
+            self.codes[size] = codes.ravel().astype(np.int32)
+            self.cells[size] = cells
+
+    def rows_mask(self, labels) -> np.ndarray:
+        """Boolean row mask over the indexed frame for the row labels of a filtered view."""
+        mask = np.zeros(len(self.index), dtype=bool)
+        positions = self.index.get_indexer(labels)
+        mask[positions[positions >= 0]] = True
+        return mask
+
+    def choose_size(self, lat_range, lon_range, max_cells=MAX_CELLS) -> float:
+        """Finest resolution at which the view spans at most `max_cells` cells."""
+        (x0, y0), (x1, y1) = project([lat_range[0], lat_range[1]], [lon_range[0], lon_range[1]])
+        area = max(abs(x1 - x0) * abs(y1 - y0), 1e-9)
+        for size in reversed(HEX_SIZES_KM):
+            if area / (1.5 * _SQRT3 * size ** 2) <= max_cells:
+                return size
+        return HEX_SIZES_KM[0]
+
+    def aggregate(self, size, mask=None) -> pd.DataFrame:
+        """Per-cell statistics at resolution `size` over the rows in `mask` (all if None)."""
+        codes = self.codes[size]
+        price, ppsf, condition = self.price, self.price_per_sqft, self.condition
+        if mask is not None:
+            codes, price, ppsf, condition = codes[mask], price[mask], ppsf[mask], condition[mask]
+        n_cells = len(self.cells[size])
+        count = np.bincount(codes, minlength=n_cells)
+        present = np.flatnonzero(count)
+        count = count[present]
+
+        # Medians: sort by (cell, price) once, then pick the middle of each run
+        order = np.lexsort((price, codes))
+        sorted_price = price[order]
+        starts = np.concatenate([[0], np.cumsum(count)[:-1]])
+        median = (sorted_price[starts + (count - 1) // 2] + sorted_price[starts + count // 2]) / 2
+
+        q, r = self.cells[size][present].T
+        lat, lon = unproject(*hex_centers(q, r, size))
+        return pd.DataFrame({
+            "cell": present,
+            "lat": lat,
+            "lon": lon,
+            "count": count,
+            "mean_price": np.bincount(codes, price, n_cells)[present] / count,
+            "median_price": median,
+            "price_per_sqft": np.bincount(codes, ppsf, n_cells)[present] / count,
+            "condition": np.bincount(codes, condition, n_cells)[present] / count,
+        })
+
+    def geojson(self, size, cells) -> dict:
+        """GeoJSON FeatureCollection of the hexagon outlines of `cells`, with id = cell."""
+        q, r = self.cells[size][np.asarray(cells)].T
+        cx, cy = hex_centers(q, r, size)
+        angles = np.radians(30 + 60 * np.arange(7))
+        lat, lon = unproject(cx[:, None] + size * np.cos(angles), cy[:, None] + size * np.sin(angles))
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "id": int(cell),
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [np.column_stack([ln, lt]).round(6).tolist()],
+                    },
+                }
+                for cell, lt, ln in zip(cells, lat, lon)
+            ],
+        }
@@ -0,0 +1,107 @@
+# core/model_registry.py
+# Versioned, on-disk store of fitted price models.
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+
+MODEL_DIR = Path("models")
+# Process umask, read once (os.umask can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def artifact_key(data_fingerprint: str, engine: str, params: dict) -> str:
+    """Hash identifying one (training data, engine, hyperparameters) combination."""
+    payload = json.dumps(
+        {"data": data_fingerprint, "engine": engine, "params": params},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _paths(key: str):
+    return MODEL_DIR / f"{key}.joblib", MODEL_DIR / f"{key}.json"
+
+
+def atomic_write(path: Path, write):
+    """
+    Call `write(tmp_path)`, then rename the result over `path`.
+
+    The temporary file is unique per call (several processes may save the
+    same key at once) and lives next to `path`, so the rename is atomic and
+    readers see either the old file or the complete new one.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        # mkstemp creates the file owner-only; give it the usual umask permissions
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def save(key: str, model, metadata: dict) -> dict:
+    """Write the fitted model and its metadata; returns the stored metadata."""
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    model_path, meta_path = _paths(key)
+    metadata = {
+        "key": key,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **metadata,
+    }
+    # Write to temp files first so a crash never leaves a half-written artifact
+    atomic_write(model_path, lambda tmp: joblib.dump(model, tmp))
+    atomic_write(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(metadata, indent=2, default=str)))
+    return metadata
+
+
+def exists(key: str) -> bool:
+    return all(p.exists() for p in _paths(key))
+
+
+def load(key: str):
+    """(model, metadata) for `key`, or None if no such artifact exists."""
+    model_path, meta_path = _paths(key)
+    if not (model_path.exists() and meta_path.exists()):
+        return None
+    return joblib.load(model_path), json.loads(meta_path.read_text())
+
+
+def list_artifacts() -> list[dict]:
+    """Metadata of every stored artifact, newest first."""
+    if not MODEL_DIR.exists():
+        return []
+    metas = [json.loads(p.read_text()) for p in MODEL_DIR.glob("*.json")]
+    return sorted(metas, key=lambda m: m.get("created_at", ""), reverse=True)
+
+
+def get_or_train(data_fingerprint: str, engine: str, params: dict, train_fn):
+    """
+    Load the artifact for (data, engine, params) or train and store it.
+
+    `train_fn()` must return (model, extra_metadata). Returns (model, metadata).
+    """
+    key = artifact_key(data_fingerprint, engine, params)
+    found = load(key)
+    if found is not None:
+        return found
+
+    start = time.perf_counter()
+    model, extra = train_fn()
+    metadata = save(key, model, {
+        "engine": engine,
+        "params": params,
+        "data_fingerprint": data_fingerprint,
+        "train_seconds": round(time.perf_counter() - start, 3),
+        **extra,
+    })
+    return model, metadata
@@ -0,0 +1,115 @@
+# core/model_selection.py
+# Cross-validated Ridge regularization path from per-fold sufficient statistics.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold
+
+from core.ridge_model import (
+    TARGET, RidgeStatistics, SparseQuadraticFeatures, model_frame,
+)
+
+DEFAULT_ALPHAS = np.logspace(-2, 4, 25)
+DEFAULT_FOLDS = 5
+
+
+def fold_statistics(df: pd.DataFrame, n_folds=DEFAULT_FOLDS, random_state=42):
+    """
+    (training, held-out) RidgeStatistics for each of `n_folds` folds of `df`.
+
+    Rows are accumulated once, per fold, in a scaling fitted on all rows so
+    that fold statistics can be added / subtracted: the training statistics
+    of fold f are total - fold_f. Both are then mapped onto the scaling a
+    fit on the training rows alone would use (the affine change of the
+    expanded features that core/incremental.py also relies on), so the
+    held-out fold never leaks into the standardization.
+    """
+    X = model_frame(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    features = SparseQuadraticFeatures().fit(X)
+    splits = KFold(n_folds, shuffle=True, random_state=random_state).split(X)
+    folds = [RidgeStatistics.from_frame(features, X.iloc[idx], y[idx]) for _, idx in splits]
+    total = folds[0]
+    for part in folds[1:]:
+        total = total + part
+
+    pairs = []
+    for fold in folds:
+        train = total - fold
+        T, t = features.affine_map(features.rescaled(train))
+        pairs.append((train.mapped(T, t), fold.mapped(T, t)))
+    return pairs
+
+
+def ridge_path(train: RidgeStatistics, alphas) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients (p x n_alphas) and intercepts for every alpha from a single
+    eigendecomposition of the centered training Gram matrix.
+    """
+    gram, xty, x_mean, y_mean = train.centered()
+    eigvals, eigvecs = np.linalg.eigh(gram)
+    projected = eigvecs.T @ xty
+    alphas = np.asarray(alphas, dtype=np.float64)
+    coefs = eigvecs @ (projected[:, None] / (eigvals[:, None] + alphas[None, :]))
+    intercepts = y_mean - x_mean @ coefs
+    return coefs, intercepts
+
+
+def path_scores(held_out: RidgeStatistics, coefs, intercepts) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Held-out R² and RMSE for each column of `coefs`, computed from the
+    held-out statistics alone (no rows are revisited):
+
+        SSE = y'y - 2 w'X'y - 2 c Σy + w'X'X w + 2 c w'Σx + n c²
+    """
+    s = held_out
+    w, c = coefs, intercepts
+    sse = (
+        s.y_sumsq
+        - 2 * (s.xty @ w) - 2 * c * s.y_sum
+        + np.einsum("ia,ia->a", w, s.xtx @ w)
+        + 2 * c * (s.x_sum @ w) + s.n * c ** 2
+    )
+    sst = s.y_sumsq - s.y_sum ** 2 / s.n
+    return 1 - sse / sst, np.sqrt(np.maximum(sse, 0) / s.n)
+
+
+def _evaluate_fold(args):
+    train, held_out, alphas = args
+    coefs, intercepts = ridge_path(train, alphas)
+    return path_scores(held_out, coefs, intercepts)
+
+
+def cross_validate_alphas(df: pd.DataFrame, alphas=DEFAULT_ALPHAS, n_folds=DEFAULT_FOLDS,
+                          random_state=42, max_workers=None) -> pd.DataFrame:
+    """
+    k-fold CV curve for the polynomial Ridge over `alphas`.
+
+    One statistics pass over the data, then one eigendecomposition per fold
+    (folds evaluated in parallel worker processes) covers every alpha.
+    Returns one row per alpha: alpha, mean/std R², mean RMSE.
+    """
+    jobs = [(train, held_out, np.asarray(alphas))
+            for train, held_out in fold_statistics(df, n_folds, random_state)]
+
+    max_workers = max_workers or min(n_folds, os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_evaluate_fold, jobs))
+    else:
+        results = [_evaluate_fold(job) for job in jobs]
+
+    r2 = np.array([r for r, _ in results])
+    rmse = np.array([e for _, e in results])
+    return pd.DataFrame({
+        "alpha": np.asarray(alphas),
+        "cv_r2": r2.mean(axis=0),
+        "cv_r2_std": r2.std(axis=0),
+        "cv_rmse": rmse.mean(axis=0),
+    })
+
+
+def best_alpha(curve: pd.DataFrame) -> float:
+    return float(curve.loc[curve["cv_r2"].idxmax(), "alpha"])
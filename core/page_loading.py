@@ -0,0 +1,134 @@
+# core/page_loading.py
+# Lazy tab rendering and per-page startup budgets.
+#
+#   python -m core.page_loading        # cold-start time of every page vs its budget
+import argparse
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock budget (ms) for one full script run of each page
+PAGE_BUDGETS_MS = {
+    "Main_Page.py": 1000,
+    "pages/Dashboard.py": 2000,
+    "pages/Linear_Model.py": 2500,
+}
+# Scales every budget, e.g. KC_PAGE_BUDGET_SCALE=2 on slow machines
+BUDGET_SCALE = float(os.environ.get("KC_PAGE_BUDGET_SCALE", 1.0))
+
+
+def lazy_tabs(labels, key):
+    """
+    st.tabs whose selection reruns the script, so only the open tab executes.
+
+    On Streamlit versions without tab state tracking every tab reports as
+    open and the page behaves like plain st.tabs.
+    """
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        return st.tabs(labels)
+
+
+def is_open(tab) -> bool:
+    return getattr(tab, "open", None) is not False
+
+
+def render_if_open(tab, module: str, *args, timer=None):
+    """Import `module` and call its render(*args) inside `tab`, only if that tab is selected."""
+    if not is_open(tab):
+        return
+    with tab, (timer.section(module) if timer is not None else _noop()):
+        importlib.import_module(module).render(*args)
+
+
+@contextmanager
+def _noop():
+    yield
+
+
+class PageTimer:
+    """
+    Measures one run of a page script against its budget in PAGE_BUDGETS_MS.
+
+    Create it at the top of the page, wrap expensive parts in `section(name)`
+    and call `finish()` at the end: the run is logged, kept in
+    session_state["page_timings"], and flagged in the sidebar when over budget.
+    """
+
+    def __init__(self, page: str):
+        self.page = page
+        self.budget_ms = PAGE_BUDGETS_MS.get(page, max(PAGE_BUDGETS_MS.values())) * BUDGET_SCALE
+        self.sections = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def section(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def finish(self) -> float:
+        total = round((time.perf_counter() - self._start) * 1000, 1)
+        st.session_state.setdefault("page_timings", {})[self.page] = {
+            "total_ms": total, "budget_ms": self.budget_ms, "sections": self.sections,
+        }
+        logger.info("%s ran in %.0f ms (budget %.0f ms) %s", self.page, total, self.budget_ms, self.sections)
+        if total > self.budget_ms:
+            slowest = max(self.sections, key=self.sections.get) if self.sections else "page body"
+            st.sidebar.caption(
+                f"⏱️ This page took {total:,.0f} ms (budget {self.budget_ms:,.0f} ms); slowest: {slowest}"
+            )
+        return total
+
+
+_MEASURE = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+elapsed = (time.perf_counter() - start) * 1000
+print(f"{elapsed:.1f} {len(at.exception)}")
+"""
+
+
+def measure_cold_start(page: str) -> tuple[float, int]:
+    """(ms, exceptions) for a first run of `page` in a fresh interpreter (imports included)."""
+    root = Path(__file__).resolve().parent.parent
+    env = {**os.environ, "PYTHONPATH": str(root)}
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE, str(root / page)],
+        capture_output=True, text=True, cwd=root, env=env, check=True,
+    )
+    ms, errors = out.stdout.split()[-2:]
+    return float(ms), int(errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every page's cold-start time against its budget.")
+    parser.add_argument("pages", nargs="*", default=list(PAGE_BUDGETS_MS))
+    args = parser.parse_args(argv)
+
+    over = 0
+    for page in args.pages:
+        ms, errors = measure_cold_start(page)
+        budget = PAGE_BUDGETS_MS.get(page, max(PAGE_BUDGETS_MS.values())) * BUDGET_SCALE
+        status = "ok" if ms <= budget and not errors else "OVER" if not errors else "ERROR"
+        over += status != "ok"
+        print(f"{page:<24} {ms:>8,.0f} ms  budget {budget:>6,.0f} ms  {status}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
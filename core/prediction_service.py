@@ -0,0 +1,258 @@
+# core/prediction_service.py
+# Headless HTTP price service with request micro-batching.
+#
+#   python -m core.prediction_service --port 8502
+#
+#   POST /predict        {"bedrooms": 3, ..., "zipcode": 98103}  -> {"price": ...}
+#   POST /predict/batch  {"rows": [{...}, {...}]}                -> {"prices": [...]}
+#   GET  /stats          latency percentiles, throughput, batch sizes
+#   GET  /health         model version
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from core.ridge_model import NUMERIC_FEATURES
+
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 64
+REQUEST_TIMEOUT_S = 10
+
+
+def _finite(row: dict, name: str) -> float:
+    """row[name] as a finite float; NaN, infinities and non-numbers raise ValueError."""
+    try:
+        value = float(row[name])
+    except (TypeError, ValueError):
+        value = math.nan
+    if not math.isfinite(value):
+        raise ValueError(f"non-numeric value for {name}")
+    return value
+
+
+def row_to_inputs(row: dict, reference_year: int):
+    """(numeric vector, zipcode) for one JSON row; raises ValueError if incomplete."""
+    row = {str(k).lower(): v for k, v in row.items()}
+    if "age_of_house" not in row and "yr_built" in row:
+        row["age_of_house"] = reference_year - _finite(row, "yr_built")
+    missing = [c for c in NUMERIC_FEATURES + ["zipcode"] if c not in row]
+    if missing:
+        raise ValueError(f"missing fields: {', '.join(missing)}")
+    values = {c: _finite(row, c) for c in NUMERIC_FEATURES + ["zipcode"]}
+    return [values[c] for c in NUMERIC_FEATURES], int(values["zipcode"])
+
+
+def payload_rows(path: str, payload):
+    """The JSON rows of a /predict or /predict/batch payload, or None if it is malformed."""
+    if path == "/predict":
+        rows = [payload]
+    else:
+        rows = payload.get("rows") if isinstance(payload, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        return None
+    return rows
+
+
+class LatencyStats:
+    """Rolling request latencies (seconds) and counters, safe to update from many threads."""
+
+    def __init__(self, window=10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+
+    def record(self, seconds, rows=1):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.rows += rows
+
+    def record_batch(self, size):
+        with self._lock:
+            self._batch_sizes.append(size)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lat = np.array(self._latencies) * 1000
+            sizes = np.array(self._batch_sizes)
+            requests, rows = self.requests, self.rows
+        uptime = time.perf_counter() - self.started
+        return {
+            "requests": requests,
+            "rows": rows,
+            "uptime_s": round(uptime, 1),
+            "throughput_rows_per_s": round(rows / uptime, 1) if uptime else None,
+            "latency_ms": {
+                "p50": round(float(np.percentile(lat, 50)), 3) if len(lat) else None,
+                "p99": round(float(np.percentile(lat, 99)), 3) if len(lat) else None,
+            },
+            "mean_micro_batch": round(float(sizes.mean()), 2) if len(sizes) else None,
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row requests into one vectorized predict.
+
+    The worker waits for the first request, then keeps collecting for up to
+    `window_ms` (or until `max_batch` rows) before scoring them together.
+    """
+
+    def __init__(self, predictor, stats, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.predictor = predictor
+        self.stats = stats
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, x, zipcode) -> Future:
+        future = Future()
+        self._queue.put((x, zipcode, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            X = np.array([item[0] for item in batch], dtype=np.float64)
+            zips = np.array([item[1] for item in batch])
+            try:
+                prices = self.predictor.predict_arrays(X, zips)
+            except Exception as err:  # hand the failure to every waiting request
+                for _, _, future in batch:
+                    future.set_exception(err)
+                continue
+            self.stats.record_batch(len(batch))
+            for (_, _, future), price in zip(batch, prices):
+                future.set_result(float(price))
+
+
+def make_handler(predictor, meta, batcher, stats):
+    reference_year = meta["reference_year"]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):  # keep the console quiet per request
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "model": meta["key"]})
+            elif self.path == "/stats":
+                self._send(200, {"model": meta["key"], **stats.snapshot()})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            start = time.perf_counter()
+            if self.path not in ("/predict", "/predict/batch"):
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                rows = payload_rows(self.path, self._read_json())
+            except ValueError:  # bad JSON or Content-Length
+                rows = None
+            if rows is None:
+                expected = "a JSON object" if self.path == "/predict" else 'a JSON object {"rows": [objects]}'
+                self._send(400, {"error": f"request body must be {expected}"})
+                return
+            try:
+                inputs = [row_to_inputs(r, reference_year) for r in rows]
+            except ValueError as err:  # messages only name the offending field
+                self._send(400, {"error": str(err)})
+                return
+
+            try:
+                if self.path == "/predict":
+                    future = batcher.submit(*inputs[0])
+                    result = {"price": future.result(timeout=REQUEST_TIMEOUT_S)}
+                else:
+                    if inputs:
+                        X = np.array([i[0] for i in inputs], dtype=np.float64)
+                        prices = predictor.predict_arrays(X, np.array([i[1] for i in inputs]))
+                    else:
+                        prices = []
+                    result = {"prices": [float(p) for p in prices]}
+            except TimeoutError:
+                self._send(503, {"error": "prediction timed out, retry later"})
+                return
+            except Exception:
+                self._send(500, {"error": "prediction failed"})
+                return
+            stats.record(time.perf_counter() - start, len(inputs))
+            self._send(200, {**result, "model": meta["key"]})
+
+    return Handler
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # The default listen backlog (5) drops connections under concurrent load
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def create_server(predictor, meta, host="127.0.0.1", port=8502,
+                  window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+    """Build (but do not start) the HTTP server; `serve_forever()` runs it."""
+    stats = LatencyStats()
+    batcher = MicroBatcher(predictor, stats, window_ms, max_batch)
+    return PredictionServer((host, port), make_handler(predictor, meta, batcher, stats))
+
+
+def main(argv=None):
+    from core.batch_scoring import load_predictor
+
+    parser = argparse.ArgumentParser(description="Serve the price model over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    predictor, meta = load_predictor()
+    server = create_server(predictor, meta, args.host, args.port, args.window_ms, args.max_batch)
+    print(f"Serving model {meta['key']} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# core/profiler.py
+# One-pass, chunked column profiling with mergeable sketches.
+#
+#   python -m core.profiler [houses.csv] [--chunk-rows 100000]
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from core.schema import DATE_FORMAT
+
+CHUNK_ROWS = 100_000
+# Items kept per level of the quantile sketch for chunked input; columns with
+# at most this many values get exact quantiles (in-memory frames always do)
+QUANTILE_CAPACITY = 1024
+# HyperLogLog registers = 2 ** HLL_PRECISION (standard error ~1.04 / sqrt(m), 1.6 %)
+HLL_PRECISION = 12
+# Distinct values are counted exactly (by hash) up to this many
+EXACT_DISTINCT = 2048
+# Heavy-hitter counters kept per column; exact when a column has fewer distinct values
+TOP_K_CAPACITY = 256
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch (a KLL-style stack of compactors).
+
+    Level h holds items of weight 2**h; a level over `capacity` is sorted
+    and every other item (random offset) is promoted to the next level.
+    Rank error is a small fraction of a percent for the capacities used
+    here, and quantiles are exact while nothing has been compacted. With
+    `capacity=None` nothing ever is: every value is kept, for columns that
+    fit in memory anyway.
+    """
+
+    def __init__(self, capacity=QUANTILE_CAPACITY, seed=0):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        if self.capacity is None:
+            return
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # An odd item out stays at this level
+                keep, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2)::2]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    @property
+    def exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def quantile(self, qs) -> np.ndarray:
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        if self.exact:
+            return np.quantile(self.levels[0], qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(items)
+        items, cumulative = items[order], np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, qs * cumulative[-1], side="left")
+        return items[np.minimum(position, len(items) - 1)]
+
+
+class DistinctSketch:
+    """
+    Distinct count: exact set of value hashes up to EXACT_DISTINCT, then a
+    HyperLogLog over 2**precision registers. Both forms merge.
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.registers = None
+
+    def add(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > EXACT_DISTINCT:
+                self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+                self._update(self.hashes)
+                self.hashes = np.empty(0, dtype=np.uint64)
+        else:
+            self._update(hashes)
+
+    def _update(self, hashes):
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        # The remaining 64 - p bits fit a float64 mantissa, so frexp gives their bit length
+        rest = (hashes & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)
+        rank = (64 - p) - np.frexp(rest)[1] + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: 'DistinctSketch') -> 'DistinctSketch':
+        if other.registers is None:
+            self.add(other.hashes)
+        else:
+            if self.registers is None:
+                self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+                self._update(self.hashes)
+                self.hashes = np.empty(0, dtype=np.uint64)
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def exact(self) -> bool:
+        return self.registers is None
+
+    def estimate(self) -> int:
+        if self.registers is None:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            raw = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(raw))
+
+
+class TopK:
+    """
+    Misra-Gries heavy hitters. Counts are exact while a column has at most
+    `capacity` distinct values; beyond that each count is low by at most
+    `error`, which is at most n / (capacity + 1).
+    """
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.error = 0
+
+    def add(self, values: pd.Series):
+        self._combine(values.value_counts(sort=False), 0)
+
+    def merge(self, other: 'TopK') -> 'TopK':
+        self._combine(other.counts, other.error)
+        return self
+
+    def _combine(self, counts: pd.Series, error: int):
+        counts = self.counts.add(counts, fill_value=0) if len(self.counts) else counts
+        self.error += error
+        if len(counts) > self.capacity:
+            threshold = int(np.sort(counts.to_numpy())[::-1][self.capacity])
+            counts = counts[counts > threshold] - threshold
+            self.error += threshold
+        self.counts = counts.astype(np.int64)
+
+    def top(self, n=10) -> pd.Series:
+        return self.counts.sort_values(ascending=False, kind="stable").head(n)
+
+
+def _kind(series: pd.Series) -> str:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    return "categorical"
+
+
+class ColumnProfile:
+    """
+    Everything the overview tabs show about one column, updated chunk by
+    chunk: count, missing and exact min / max for every kind; exact central
+    moments (mean, std, skew, kurtosis) and sketched quantiles for numeric
+    columns; a distinct count and top values for all.
+
+    Moments of chunks are combined with the pairwise update of Chan et al.
+    / Pébay, so they match a single pass over the whole column.
+    """
+
+    def __init__(self, name: str, kind: str, dtype, quantile_capacity=QUANTILE_CAPACITY):
+        self.name = name
+        self.kind = kind
+        self.dtype = dtype
+        self.count = 0
+        self.missing = 0
+        self.min = None
+        self.max = None
+        self.moments = np.zeros(4)  # mean, M2, M3, M4 (sums of powers of deviations)
+        self.quantiles = QuantileSketch(quantile_capacity)
+        self.distinct = DistinctSketch()
+        self.top_values = TopK()
+
+    def add(self, series: pd.Series):
+        present = series.dropna()
+        self.missing += len(series) - len(present)
+        if not len(present):
+            return
+        self.distinct.add(pd.util.hash_pandas_object(present, index=False).to_numpy())
+        self.top_values.add(present)
+
+        if self.kind == "categorical":
+            self.count += len(present)
+            return
+        if self.kind == "datetime":
+            values = present.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        else:
+            values = pd.to_numeric(present, errors="coerce").to_numpy(dtype=np.float64)
+            self.missing += int(np.isnan(values).sum())
+            values = values[~np.isnan(values)]
+            if not len(values):
+                return
+        lo, hi = values.min(), values.max()
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+        self.quantiles.add(values)
+        if self.kind == "numeric":
+            mean = values.mean()
+            d = values - mean
+            d2 = d * d
+            chunk = np.array([mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum()])
+            self._combine_moments(len(values), chunk)
+        self.count += len(values)
+
+    def _combine_moments(self, nb, b):
+        na = self.count
+        if na == 0:
+            self.moments = b
+            return
+        n = na + nb
+        mean_a, m2a, m3a, m4a = self.moments
+        mean_b, m2b, m3b, m4b = b
+        delta = mean_b - mean_a
+        self.moments = np.array([
+            mean_a + delta * nb / n,
+            m2a + m2b + delta ** 2 * na * nb / n,
+            m3a + m3b + delta ** 3 * na * nb * (na - nb) / n ** 2
+            + 3 * delta * (na * m2b - nb * m2a) / n,
+            m4a + m4b + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+            + 6 * delta ** 2 * (na * na * m2b + nb * nb * m2a) / n ** 2
+            + 4 * delta * (na * m3b - nb * m3a) / n,
+        ])
+
+    def merge(self, other: 'ColumnProfile') -> 'ColumnProfile':
+        if other.kind == "numeric" and other.count:
+            self._combine_moments(other.count, other.moments)
+        self.count += other.count
+        self.missing += other.missing
+        for attr, pick in (("min", min), ("max", max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        return self
+
+    def _value(self, v):
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            return None
+        if self.kind == "datetime":
+            return pd.Timestamp(int(v), unit="ns")
+        return float(v)
+
+    def stats(self) -> dict:
+        """Summary statistics (pandas describe() names, plus skew / kurtosis / distinct / missing)."""
+        out = {"count": self.count, "missing": self.missing, "distinct": self.distinct.estimate()}
+        if self.kind == "categorical":
+            return out
+        out["min"] = self._value(self.min)
+        for q, v in zip(QUANTILES, self.quantiles.quantile(QUANTILES)):
+            out[f"{q:.0%}"] = self._value(v)
+        out["max"] = self._value(self.max)
+        if self.kind == "numeric":
+            n = self.count
+            mean, m2, m3, m4 = self.moments
+            out["mean"] = float(mean) if n else None
+            out["std"] = float(np.sqrt(m2 / (n - 1))) if n > 1 else None
+            # Bias-corrected sample skewness / excess kurtosis, as pandas computes them
+            if n > 2 and m2 > 0:
+                g1 = np.sqrt(n) * m3 / m2 ** 1.5
+                out["skew"] = float(g1 * np.sqrt(n * (n - 1)) / (n - 2))
+            if n > 3 and m2 > 0:
+                g2 = n * m4 / m2 ** 2 - 3
+                out["kurtosis"] = float((n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6))
+        return out
+
+    def median(self):
+        return self._value(self.quantiles.quantile(0.5)[0])
+
+
+class DatasetProfile:
+    """
+    Column profiles for a whole dataset, built in one pass over chunks.
+
+    Only the sketches are kept, so memory does not grow with the number of
+    rows; profiles of disjoint row sets combine with `merge`, which is how
+    `from_chunks` (and `profile_csv`) handle files larger than memory. A
+    frame already in memory (`from_frame`) keeps its numeric values instead
+    of sketching them, so its quantiles are exact.
+    """
+
+    def __init__(self, columns: dict[str, ColumnProfile], rows=0, quantile_capacity=QUANTILE_CAPACITY):
+        self.columns = columns
+        self.rows = rows
+        self.quantile_capacity = quantile_capacity
+
+    @classmethod
+    def from_chunks(cls, chunks, quantile_capacity=QUANTILE_CAPACITY) -> 'DatasetProfile':
+        profile = cls({}, quantile_capacity=quantile_capacity)
+        for chunk in chunks:
+            profile.add(chunk)
+        return profile
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, chunk_rows=CHUNK_ROWS) -> 'DatasetProfile':
+        return cls.from_chunks(
+            (df.iloc[i:i + chunk_rows] for i in range(0, max(len(df), 1), chunk_rows)), quantile_capacity=None
+        )
+
+    def add(self, chunk: pd.DataFrame):
+        for name in chunk.columns:
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(name, _kind(chunk[name]), chunk[name].dtype,
+                                                   self.quantile_capacity)
+                # Rows seen before the column first appeared count as missing
+                self.columns[name].missing += self.rows
+            self.columns[name].add(chunk[name])
+        for name in self.columns.keys() - set(chunk.columns):
+            self.columns[name].missing += len(chunk)
+        self.rows += len(chunk)
+
+    def merge(self, other: 'DatasetProfile') -> 'DatasetProfile':
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+                column.missing += self.rows
+        for name in self.columns.keys() - other.columns.keys():
+            self.columns[name].missing += other.rows
+        self.rows += other.rows
+        return self
+
+    def column(self, name: str):
+        """Profile of `name`, matched case-insensitively (None if absent)."""
+        if name in self.columns:
+            return self.columns[name]
+        matches = [c for c in self.columns if str(c).lower() == name.lower()]
+        return self.columns[matches[0]] if matches else None
+
+    def describe(self, kinds=("numeric",)) -> pd.DataFrame:
+        """One row per column of the given kinds, in the style of DataFrame.describe().T."""
+        order = ["count", "missing", "distinct", "mean", "std", "min", "25%", "50%", "75%",
+                 "max", "skew", "kurtosis"]
+        rows = {name: c.stats() for name, c in self.columns.items() if c.kind in kinds}
+        table = pd.DataFrame.from_dict(rows, orient="index")
+        return table[[c for c in order if c in table.columns]]
+
+
+def profile_csv(source, chunk_rows=CHUNK_ROWS, date_columns=("date",), date_format=DATE_FORMAT) -> DatasetProfile:
+    """Profile a CSV (path or file object) without loading it; `date_columns` are parsed as dates."""
+    def chunks():
+        for chunk in pd.read_csv(source, chunksize=chunk_rows):
+            for col in date_columns:
+                if col in chunk.columns:
+                    chunk[col] = pd.to_datetime(chunk[col], format=date_format, errors="coerce")
+            yield chunk
+
+    return DatasetProfile.from_chunks(chunks())
+
+
+def main(argv=None):
+    from core.data_loader import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Profile every column of a CSV in one chunked pass.")
+    parser.add_argument("input", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    profile = profile_csv(args.input, args.chunk_rows)
+    print(f"{profile.rows:,} rows, {len(profile.columns)} columns")
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(profile.describe().round(3).to_string())
+        for kind in ("datetime", "categorical"):
+            table = profile.describe(kinds=(kind,))
+            if not table.empty:
+                print(f"\n{table.to_string()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# core/readonly.py
+# Immutable wrapper for the process-wide dataset shared through st.cache_resource.
+import numpy as np
+import pandas as pd
+
+_INPLACE_METHODS = (
+    "clip", "drop", "drop_duplicates", "dropna", "fillna", "interpolate", "mask",
+    "query", "eval", "rename", "rename_axis", "replace", "reset_index",
+    "set_index", "sort_index", "sort_values", "where",
+)
+
+
+class ReadOnlyError(TypeError):
+    """Raised when code tries to modify the shared dataset in place."""
+
+
+def _refuse(what):
+    raise ReadOnlyError(
+        f"The shared dataset is read-only ({what}). "
+        "Derive a view with .assign(...) or a selection instead of writing into it."
+    )
+
+
+class _ReadOnlyIndexer:
+    def __init__(self, indexer, name):
+        self._indexer = indexer
+        self._name = name
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        _refuse(f".{self._name}[...] assignment")
+
+
+class FrozenFrame(pd.DataFrame):
+    """
+    DataFrame that rejects column and value assignment.
+
+    Any derived result (selection, .assign, groupby output, ...) is a regular,
+    mutable DataFrame; with copy-on-write those share the frozen column
+    buffers until they are written to, so handing views to the tabs costs
+    no copy of the base data.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def __setitem__(self, key, value):
+        _refuse(f"df[{key!r}] = ...")
+
+    def __delitem__(self, key):
+        _refuse(f"del df[{key!r}]")
+
+    def __setattr__(self, name, value):
+        if name in ("columns", "index") or (
+            not name.startswith("_") and name in getattr(self, "columns", ())
+        ):
+            _refuse(f"df.{name} = ...")
+        super().__setattr__(name, value)
+
+    def insert(self, *args, **kwargs):
+        _refuse("insert")
+
+    def pop(self, item):
+        _refuse("pop")
+
+    def update(self, *args, **kwargs):
+        _refuse("update")
+
+    loc = property(lambda self: _ReadOnlyIndexer(pd.DataFrame.loc.fget(self), "loc"))
+    iloc = property(lambda self: _ReadOnlyIndexer(pd.DataFrame.iloc.fget(self), "iloc"))
+    at = property(lambda self: _ReadOnlyIndexer(pd.DataFrame.at.fget(self), "at"))
+    iat = property(lambda self: _ReadOnlyIndexer(pd.DataFrame.iat.fget(self), "iat"))
+
+
+def _guard_inplace(name):
+    method = getattr(pd.DataFrame, name)
+
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            _refuse(f"{name}(inplace=True)")
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in _INPLACE_METHODS:
+    setattr(FrozenFrame, _name, _guard_inplace(_name))
+
+
+def freeze(df: pd.DataFrame, copy=True) -> FrozenFrame:
+    """
+    Return a FrozenFrame over `df` whose numeric column buffers are marked
+    non-writeable, so even writes through ``.values`` / ``.to_numpy()`` fail.
+
+    With ``copy=False`` the buffers of `df` are reused; only pass it for a
+    frame nothing else holds (e.g. one just loaded), since `df` itself stays
+    writeable.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            arr = series.to_numpy(copy=copy)
+            arr.flags.writeable = False
+            columns[col] = arr
+        else:
+            columns[col] = series.array
+    frozen = FrozenFrame(columns, index=df.index, copy=False)
+    frozen.attrs.update(df.attrs)
+    return frozen
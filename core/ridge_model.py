@@ -0,0 +1,365 @@
+# core/ridge_model.py
+# Degree-2 polynomial Ridge price model with sparse interaction features.
+import numpy as np
+import pandas as pd
+import scipy.linalg as sla
+import scipy.sparse as sp
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+
+from core import model_registry
+
+NUMERIC_FEATURES = [
+    "bedrooms", "bathrooms", "sqft_living", "sqft_lot", "floors", "waterfront",
+    "view", "condition", "grade", "sqft_above", "sqft_basement", "yr_renovated",
+    "lat", "long", "sqft_living15", "sqft_lot15", "age_of_house",
+]
+CATEGORICAL_FEATURE = "zipcode"
+INPUT_FEATURES = NUMERIC_FEATURES + [CATEGORICAL_FEATURE]
+TARGET = "price"
+
+DEFAULT_PARAMS = {"alpha": 10.0, "test_size": 0.2, "random_state": 42}
+
+# Registry name; bump the version whenever the features or solver change
+ENGINE = "poly_ridge"
+ENGINE_VERSION = 2
+
+# Rows expanded at a time when accumulating statistics
+CHUNK_ROWS = 50_000
+
+
+class SparseQuadraticFeatures:
+    """
+    Degree-2 expansion of the standardized numeric inputs plus zipcode dummies.
+
+    Equivalent in span to PolynomialFeatures(degree=2) over the numeric
+    columns and one-hot zipcodes, minus the structurally zero terms:
+    dummy x dummy products are 0 for different zipcodes and duplicate the
+    dummy itself for the same one. Layout of the output columns:
+
+        [ z (p) | z_i * z_j, i <= j | d (k) | z_i * d_k ]
+
+    where z are the standardized numeric inputs and d the zipcode dummies
+    (first zipcode dropped, as with get_dummies(drop_first=True)). Dummies
+    are divided by their standard deviation but not centered, so every row
+    has at most 1 + p non-zero zipcode terms and the matrix stays sparse.
+    """
+
+    def __init__(self, numeric=NUMERIC_FEATURES, categorical=CATEGORICAL_FEATURE):
+        self.numeric = list(numeric)
+        self.categorical = categorical
+
+    def fit(self, df: pd.DataFrame):
+        X = df[self.numeric].to_numpy(dtype=np.float64)
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+
+        levels = np.sort(pd.unique(np.asarray(df[self.categorical])))
+        self.levels_ = levels[1:]
+        share = np.asarray(df[self.categorical])[:, None] == self.levels_[None, :]
+        share = share.mean(axis=0)
+        self.dummy_scale_ = np.sqrt(share * (1 - share))
+        self.dummy_scale_[self.dummy_scale_ == 0] = 1.0
+
+        p = len(self.numeric)
+        self.pairs_ = np.triu_indices(p)
+        self.n_quadratic_ = p + len(self.pairs_[0])
+        self.n_features_ = self.n_quadratic_ + len(self.levels_) * (1 + p)
+        return self
+
+    def standardize(self, df: pd.DataFrame) -> np.ndarray:
+        return (df[self.numeric].to_numpy(dtype=np.float64) - self.mean_) / self.scale_
+
+    def level_index(self, values) -> np.ndarray:
+        """Position of each zipcode in levels_, -1 for the dropped/unknown ones."""
+        values = np.asarray(values)
+        pos = np.searchsorted(self.levels_, values)
+        pos = np.clip(pos, 0, max(len(self.levels_) - 1, 0))
+        found = len(self.levels_) > 0
+        return np.where(found & (self.levels_[pos] == values), pos, -1)
+
+    def transform(self, df: pd.DataFrame) -> sp.csr_matrix:
+        quadratic, zip_part = self.transform_blocks(df)
+        return sp.hstack([sp.csr_matrix(quadratic), zip_part], format="csr")
+
+    def transform_blocks(self, df: pd.DataFrame):
+        """The dense numeric block and the sparse zipcode block of transform()."""
+        z = self.standardize(df)
+        n, p = z.shape
+        quadratic = np.hstack([z, z[:, self.pairs_[0]] * z[:, self.pairs_[1]]])
+
+        # Zipcode block: one dummy column and p interaction columns per row
+        k = self.level_index(df[self.categorical])
+        rows = np.flatnonzero(k >= 0)
+        k = k[rows]
+        w = 1.0 / self.dummy_scale_[k]
+        n_levels = len(self.levels_)
+        inter_cols = n_levels + k[:, None] * p + np.arange(p)[None, :]
+        zip_part = sp.csr_matrix(
+            (
+                np.concatenate([w, (z[rows] * w[:, None]).ravel()]),
+                (
+                    np.concatenate([rows, np.repeat(rows, p)]),
+                    np.concatenate([k, inter_cols.ravel()]),
+                ),
+            ),
+            shape=(n, n_levels * (1 + p)),
+        )
+        return quadratic, zip_part
+
+    def rescaled(self, stats: 'RidgeStatistics') -> 'SparseQuadraticFeatures':
+        """
+        The scaling `fit` would produce on the rows summarized by `stats`
+        (statistics in this feature space), keeping these levels and pairs.
+        The numeric means / variances come from the sums of z and z², the
+        zipcode shares from the dummy sums, so no row is revisited.
+        """
+        p, q, n = len(self.numeric), self.n_quadratic_, stats.n
+        i, j = self.pairs_
+        z_mean = stats.x_sum[:p] / n
+        z_sq = stats.x_sum[p:q][i == j] / n
+
+        features = SparseQuadraticFeatures(self.numeric, self.categorical)
+        features.levels_ = self.levels_
+        features.pairs_ = self.pairs_
+        features.n_quadratic_ = self.n_quadratic_
+        features.n_features_ = self.n_features_
+        features.mean_ = self.mean_ + self.scale_ * z_mean
+        features.scale_ = self.scale_ * np.sqrt(np.maximum(z_sq - z_mean ** 2, 0.0))
+        features.scale_[features.scale_ == 0] = 1.0
+        share = stats.x_sum[q:q + len(self.levels_)] * self.dummy_scale_ / n
+        features.dummy_scale_ = np.sqrt(share * (1 - share))
+        features.dummy_scale_[features.dummy_scale_ == 0] = 1.0
+        return features
+
+    def affine_map(self, target: 'SparseQuadraticFeatures') -> tuple[sp.csr_matrix, np.ndarray]:
+        """
+        (T, t) with target.transform(x) = T @ self.transform(x) + t for every
+        row, for a `target` that only differs in its scaling (same levels and
+        pairs). T is sparse: each expanded feature depends on at most three
+        of the reference ones.
+        """
+        p = len(self.numeric)
+        n_levels = len(self.levels_)
+        q = self.n_quadratic_
+        a = (target.mean_ - self.mean_) / self.scale_
+        b = target.scale_ / self.scale_
+        r = self.dummy_scale_ / target.dummy_scale_
+
+        rows, cols, values = [], [], []
+
+        def put(r_, c_, v_):
+            rows.append(r_)
+            cols.append(c_)
+            values.append(v_)
+
+        t = np.zeros(self.n_features_)
+        idx = np.arange(p)
+        # z_i = (z0_i - a_i) / b_i
+        put(idx, idx, 1 / b)
+        t[:p] = -a / b
+        # z_i z_j = (z0_i z0_j - a_j z0_i - a_i z0_j + a_i a_j) / (b_i b_j)
+        i, j = self.pairs_
+        m = p + np.arange(len(i))
+        inv = 1 / (b[i] * b[j])
+        put(m, m, inv)
+        put(m, i, -a[j] * inv)
+        put(m, j, -a[i] * inv)
+        t[m] = a[i] * a[j] * inv
+        # d_k = d0_k * r_k ;  z_i d_k = (z0_i d0_k - a_i d0_k) * r_k / b_i
+        k = np.arange(n_levels)
+        put(q + k, q + k, r)
+        kk, ii = np.divmod(np.arange(n_levels * p), p)
+        inter = q + n_levels + kk * p + ii
+        put(inter, inter, r[kk] / b[ii])
+        put(inter, q + kk, -a[ii] * r[kk] / b[ii])
+        # Duplicate (row, col) entries (the i == j pairs) are summed
+        T = sp.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.n_features_, self.n_features_),
+        )
+        return T, t
+
+    def feature_names(self) -> list[str]:
+        names = list(self.numeric)
+        names += [
+            f"{self.numeric[i]}^2" if i == j else f"{self.numeric[i]} {self.numeric[j]}"
+            for i, j in zip(*self.pairs_)
+        ]
+        names += [f"{self.categorical}_{level}" for level in self.levels_]
+        names += [
+            f"{name} {self.categorical}_{level}" for level in self.levels_ for name in self.numeric
+        ]
+        return names
+
+
+class RidgeStatistics:
+    """
+    Sufficient statistics of a Ridge fit: n, column sums, X^T X, X^T y, y sums.
+
+    X^T X is assembled block-wise (dense numeric block via BLAS, zipcode block
+    as sparse products), so its cost follows the non-zero interactions rather
+    than the full quadratic expansion. Statistics over disjoint rows add up.
+    """
+
+    def __init__(self, n, x_sum, xtx, xty, y_sum, y_sumsq):
+        self.n = n
+        self.x_sum = x_sum
+        self.xtx = xtx
+        self.xty = xty
+        self.y_sum = y_sum
+        self.y_sumsq = y_sumsq
+
+    @classmethod
+    def from_blocks(cls, quadratic, zip_part, y):
+        y = np.asarray(y, dtype=np.float64)
+        zip_t = zip_part.T.tocsr()
+        gram_zq = zip_t @ quadratic
+        xtx = np.block([
+            [quadratic.T @ quadratic, gram_zq.T],
+            [gram_zq, (zip_t @ zip_part).toarray()],
+        ])
+        x_sum = np.concatenate([quadratic.sum(axis=0), np.asarray(zip_part.sum(axis=0)).ravel()])
+        xty = np.concatenate([quadratic.T @ y, zip_t @ y])
+        return cls(len(y), x_sum, xtx, xty, y.sum(), y @ y)
+
+    @classmethod
+    def from_frame(cls, features, df: pd.DataFrame, y, chunk_rows=CHUNK_ROWS, progress=None):
+        """Accumulate over `df` in chunks; `progress(fraction)` is called after each one."""
+        y = np.asarray(y, dtype=np.float64)
+        stats = None
+        for start in range(0, len(df), chunk_rows):
+            part = cls.from_blocks(
+                *features.transform_blocks(df.iloc[start:start + chunk_rows]),
+                y[start:start + chunk_rows],
+            )
+            stats = part if stats is None else stats + part
+            if progress is not None:
+                progress(min(start + chunk_rows, len(df)) / len(df))
+        return stats
+
+    def __add__(self, other):
+        return RidgeStatistics(
+            self.n + other.n, self.x_sum + other.x_sum, self.xtx + other.xtx,
+            self.xty + other.xty, self.y_sum + other.y_sum, self.y_sumsq + other.y_sumsq,
+        )
+
+    def __sub__(self, other):
+        return RidgeStatistics(
+            self.n - other.n, self.x_sum - other.x_sum, self.xtx - other.xtx,
+            self.xty - other.xty, self.y_sum - other.y_sum, self.y_sumsq - other.y_sumsq,
+        )
+
+    def mapped(self, T, t) -> 'RidgeStatistics':
+        """Statistics of the affinely changed features T @ x + t, without revisiting rows."""
+        Tx = T @ self.x_sum
+        xtx = np.asarray(T @ (T @ self.xtx).T) + np.outer(Tx, t) + np.outer(t, Tx) + self.n * np.outer(t, t)
+        return RidgeStatistics(
+            self.n, Tx + self.n * t, xtx, T @ self.xty + t * self.y_sum, self.y_sum, self.y_sumsq
+        )
+
+    def centered(self):
+        """(X_c^T X_c, X_c^T y_c, x_mean, y_mean) for an unpenalized intercept."""
+        x_mean = self.x_sum / self.n
+        y_mean = self.y_sum / self.n
+        gram = self.xtx - self.n * np.outer(x_mean, x_mean)
+        xty = self.xty - self.n * x_mean * y_mean
+        return gram, xty, x_mean, y_mean
+
+    def solve(self, alpha):
+        """Ridge (coef, intercept), same objective as sklearn's Ridge(fit_intercept=True)."""
+        gram, xty, x_mean, y_mean = self.centered()
+        gram[np.diag_indices_from(gram)] += alpha
+        coef = sla.solve(gram, xty, assume_a="pos")
+        return coef, y_mean - x_mean @ coef
+
+
+class PolyRidgeModel:
+    """
+    SparseQuadraticFeatures followed by Ridge, fitted on raw input columns.
+
+    The Ridge system is solved in closed form from RidgeStatistics (a
+    Cholesky solve of a ~1.4k x 1.4k Gram matrix) instead of materializing
+    the dense ~3.8k-column PolynomialFeatures matrix.
+    """
+
+    def __init__(self, alpha=DEFAULT_PARAMS["alpha"]):
+        self.alpha = alpha
+
+    def fit(self, df: pd.DataFrame, y, progress=None):
+        """`progress(fraction, message)`, if given, is reported while fitting."""
+        report = progress or (lambda fraction, message: None)
+        report(0.0, "Fitting feature scaling")
+        self.features_ = SparseQuadraticFeatures().fit(df)
+        self.stats_ = RidgeStatistics.from_frame(
+            self.features_, df, y,
+            progress=lambda f: report(0.05 + 0.75 * f, "Accumulating X^T X"),
+        )
+        report(0.8, "Solving Ridge system")
+        self.coef_, self.intercept_ = self.stats_.solve(self.alpha)
+        return self
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        quadratic, zip_part = self.features_.transform_blocks(df)
+        q = self.features_.n_quadratic_
+        return quadratic @ self.coef_[:q] + zip_part @ self.coef_[q:] + self.intercept_
+
+
+def model_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Input columns of `df` in model order (age_of_house must be present)."""
+    return df[INPUT_FEATURES]
+
+
+def train_model(df: pd.DataFrame, alpha=DEFAULT_PARAMS["alpha"],
+                test_size=DEFAULT_PARAMS["test_size"], random_state=DEFAULT_PARAMS["random_state"],
+                progress=None):
+    """
+    Fit PolyRidgeModel on an 80/20 split of `df`.
+
+    Returns (model, train_r2, test_r2).
+    """
+    X = model_frame(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    train_idx, test_idx = train_test_split(
+        np.arange(len(df)), test_size=test_size, random_state=random_state
+    )
+    model = PolyRidgeModel(alpha=alpha).fit(X.iloc[train_idx], y[train_idx], progress)
+    if progress is not None:
+        progress(0.9, "Scoring train/test split")
+    train_r2 = r2_score(y[train_idx], model.predict(X.iloc[train_idx]))
+    test_r2 = r2_score(y[test_idx], model.predict(X.iloc[test_idx]))
+    return model, train_r2, test_r2
+
+
+def full_params(params=None) -> dict:
+    """`params` completed with the defaults and the engine version (the registry key input)."""
+    return {**DEFAULT_PARAMS, **(params or {}), "engine_version": ENGINE_VERSION}
+
+
+def artifact_key(data_fingerprint: str, params=None) -> str:
+    return model_registry.artifact_key(data_fingerprint, ENGINE, full_params(params))
+
+
+def load_or_train(df: pd.DataFrame, data_fingerprint: str, params=None, progress=None):
+    """
+    Fitted model for this dataset version and params, from the model registry
+    when available. Returns (model, metadata) with the R² scores in metadata.
+    """
+    params = full_params(params)
+
+    def train():
+        model, train_r2, test_r2 = train_model(
+            df, params["alpha"], params["test_size"], params["random_state"], progress
+        )
+        return model, {
+            "train_r2": train_r2,
+            "test_r2": test_r2,
+            "n_rows": len(df),
+            # age_of_house is measured from this year (see core/features.py)
+            "reference_year": int(df["yr_built"].max()),
+            "input_features": INPUT_FEATURES,
+            "n_expanded_features": model.features_.n_features_,
+        }
+
+    return model_registry.get_or_train(data_fingerprint, ENGINE, params, train)
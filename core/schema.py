@@ -0,0 +1,98 @@
+# core/schema.py
+# Compact in-memory storage types for the King County dataset.
+import pandas as pd
+
+# Bump when STORAGE_DTYPES changes so stale on-disk caches are not reused
+SCHEMA_VERSION = 1
+
+STORAGE_DTYPES = {
+    "id": "int64",
+    "price": "float32",          # integer prices < 2^24 are exact in float32
+    "bedrooms": "int8",
+    "bathrooms": "float32",      # quarter steps are exact
+    "sqft_living": "int32",
+    "sqft_lot": "int32",
+    "floors": "float32",         # half steps are exact
+    "waterfront": "int8",
+    "view": "int8",
+    "condition": "int8",
+    "grade": "int8",
+    "sqft_above": "int16",
+    "sqft_basement": "int16",
+    "yr_built": "int16",
+    "yr_renovated": "int16",
+    "zipcode": "category",
+    "lat": "float32",
+    "long": "float32",
+    "sqft_living15": "int16",
+    "sqft_lot15": "int32",
+}
+
+DATE_FORMAT = "%Y%m%dT%H%M%S"
+
+# Value domains documented in main_tabs/preprocessing.py (inclusive bounds)
+VALUE_RANGES = {
+    "price": (0, 10_000_000),
+    "bedrooms": (0, 40),
+    "bathrooms": (0, 10),
+    "sqft_living": (0, 20_000),
+    "sqft_lot": (0, 2_000_000),
+    "floors": (1, 3.5),
+    "waterfront": (0, 1),
+    "view": (0, 4),
+    "condition": (1, 5),
+    "grade": (1, 13),
+    "sqft_above": (0, 20_000),
+    "sqft_basement": (0, 20_000),
+    "yr_built": (1800, 2015),
+    "yr_renovated": (0, 2015),
+    "lat": (47.0, 48.0),
+    "long": (-123.0, -121.0),
+    "sqft_living15": (0, 20_000),
+    "sqft_lot15": (0, 2_000_000),
+}
+
+
+def range_violations(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per column with values outside VALUE_RANGES (empty if clean)."""
+    rows = []
+    for col, (lo, hi) in VALUE_RANGES.items():
+        if col not in df.columns:
+            continue
+        bad = ~df[col].between(lo, hi)
+        if bad.any():
+            rows.append({
+                "column": col,
+                "allowed": f"[{lo}, {hi}]",
+                "violations": int(bad.sum()),
+                "min": df[col].min(),
+                "max": df[col].max(),
+            })
+    return pd.DataFrame(rows, columns=["column", "allowed", "violations", "min", "max"])
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validate `df` against VALUE_RANGES, downcast it to STORAGE_DTYPES and
+    parse the raw `date` strings.
+
+    Raises ValueError if any value falls outside its documented range, since
+    the narrow integer types would otherwise silently wrap. The before/after
+    memory footprint is kept in ``df.attrs["memory_mb"]``.
+    """
+    violations = range_violations(df)
+    if not violations.empty:
+        raise ValueError(
+            "Values outside the documented ranges:\n" + violations.to_string(index=False)
+        )
+
+    before = memory_mb(df)
+    out = df.astype({c: t for c, t in STORAGE_DTYPES.items() if c in df.columns})
+    if "date" in out.columns and not pd.api.types.is_datetime64_any_dtype(out["date"]):
+        out["date"] = pd.to_datetime(out["date"], format=DATE_FORMAT)
+    out.attrs["memory_mb"] = {"before": round(float(before), 2), "after": round(float(memory_mb(out)), 2)}
+    return out
@@ -0,0 +1,122 @@
+# core/training_jobs.py
+# Background model training in worker processes, with on-disk progress.
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core import model_registry
+
+JOB_DIR = model_registry.MODEL_DIR / "jobs"
+# A "running" status file not updated for this long is treated as abandoned
+STALE_SECONDS = 15 * 60
+
+
+def status_path(key: str) -> Path:
+    return JOB_DIR / f"{key}.json"
+
+
+def write_status(key: str, state: str, progress=0.0, message="", **extra):
+    """Atomically record a job's state: queued / running / done / failed."""
+    JOB_DIR.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "key": key,
+        "state": state,
+        "progress": round(float(progress), 3),
+        "message": message,
+        "updated_at": time.time(),
+        **extra,
+    }
+    model_registry.atomic_write(status_path(key), lambda tmp: Path(tmp).write_text(json.dumps(payload)))
+
+
+def read_status(key: str):
+    """Last recorded status dict of the job for `key`, or None."""
+    try:
+        return json.loads(status_path(key).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _is_active(status) -> bool:
+    return (
+        status is not None
+        and status["state"] in ("queued", "running")
+        and time.time() - status["updated_at"] < STALE_SECONDS
+    )
+
+
+def _train_in_worker(key, engine, df, fingerprint, params):
+    """Worker-process entry point: fit and register the model, reporting progress."""
+    from core.engines import get_engine
+
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def progress(fraction, message):
+        write_status(key, "running", fraction, message, started_at=started)
+
+    try:
+        _, meta = get_engine(engine).load_or_train(df, fingerprint, params, progress=progress)
+    except Exception as err:
+        write_status(key, "failed", 1.0, f"{type(err).__name__}: {err}",
+                     started_at=started, traceback=traceback.format_exc())
+        raise
+    write_status(key, "done", 1.0, "Model registered", started_at=started,
+                 train_seconds=meta["train_seconds"])
+    return meta["key"]
+
+
+class TrainingJobRunner:
+    """
+    Runs model fits in a process pool so the UI thread never blocks on them.
+
+    Jobs are identified by their registry artifact key: submitting a key that
+    is already queued or running (in this process, or by another app process
+    sharing `models/`) is a no-op, so concurrent sessions asking for the same
+    model trigger a single fit. A failed job stays failed (pages submit on
+    every rerun, and a deterministic failure would otherwise relaunch
+    forever) until it is submitted again with `retry=True`. Progress is read
+    from the job's status file.
+    """
+
+    def __init__(self, max_workers=None):
+        # One worker per core, so fits of different engines run side by side
+        max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, engine: str, df, fingerprint: str, params: dict, retry=False) -> bool:
+        """
+        Queue a fit of `engine` as the artifact `key`; returns False if it is
+        already in flight, registered, or failed (unless `retry`).
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                return False
+            status = self.status(key)
+            if model_registry.exists(key) or _is_active(status):
+                return False
+            if status is not None and status["state"] == "failed" and not retry:
+                return False
+            write_status(key, "queued", 0.0, "Waiting for a worker")
+            self._futures[key] = self._pool.submit(_train_in_worker, key, engine, df, fingerprint, params)
+            return True
+
+    def status(self, key: str):
+        status = read_status(key)
+        future = self._futures.get(key)
+        # A worker that died before writing its final status (e.g. killed)
+        if future is not None and future.done() and _is_active(status):
+            err = future.exception()
+            write_status(key, "failed", 1.0, f"Worker exited: {err}")
+            status = read_status(key)
+        return status
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -2,47 +2,38 @@ import streamlit as st
 import pandas as pd
 from typing import Optional
 
-def _parse_date(series: pd.Series) -> Optional[pd.Series]:
-    try:
-        return pd.to_datetime(series, errors="coerce")
-    except Exception:
-        return None
+from core.profiler import DatasetProfile
 
-def render(df_filtered: pd.DataFrame):
+
+def render(df_filtered: pd.DataFrame, profile: Optional[DatasetProfile] = None):
     st.header("📌 Dataset Overview — King County House Sales (Seattle Area)")
 
-    # Ensure typical kc_house columns exist
-    expected_cols = {
-        "price","zipcode","sqft_living","yr_built","date","bedrooms","bathrooms",
-        "sqft_lot","floors","waterfront","view","condition","grade","sqft_above",
-        "sqft_basement","yr_renovated","lat","long","sqft_living15","sqft_lot15","id"
-    }
-    available = set(df_filtered.columns.str.lower())
-    # Create a case-insensitive accessor
-    df = df_filtered.copy()
-    df.columns = [c.lower() for c in df.columns]
+    # Every statistic below comes from one chunked pass (core/profiler.py);
+    # column lookups are case-insensitive, so the frame is never renamed
+    if profile is None:
+        profile = DatasetProfile.from_frame(df_filtered)
 
     # ---- Top summary cards ----
     col1, col2, col3 = st.columns([1, 1, 1])
 
     # 1) Unique ZIP codes
-    if "zipcode" in df.columns:
-        num_zips = df["zipcode"].nunique()
-        col1.metric("📮 Unique ZIP Codes", f"{num_zips}")
+    zipcode = profile.column("zipcode")
+    if zipcode is not None:
+        col1.metric("📮 Unique ZIP Codes", f"{zipcode.distinct.estimate()}")
     else:
         col1.metric("📮 Unique ZIP Codes", "—")
 
     # 2) Average Price
-    if "price" in df.columns:
-        avg_price = df["price"].mean()
-        col2.metric("💰 Avg. Price", f"${avg_price:,.0f}")
+    price = profile.column("price")
+    if price is not None and price.kind == "numeric":
+        col2.metric("💰 Avg. Price", f"${price.stats()['mean']:,.0f}")
     else:
         col2.metric("💰 Avg. Price", "—")
 
     # 3) Median Living Area
-    if "sqft_living" in df.columns:
-        med_living = df["sqft_living"].median()
-        col3.metric("📏 Median Living Area", f"{med_living:,.0f} sqft")
+    living = profile.column("sqft_living")
+    if living is not None and living.kind == "numeric":
+        col3.metric("📏 Median Living Area", f"{living.median():,.0f} sqft")
     else:
         col3.metric("📏 Median Living Area", "—")
 
@@ -51,11 +42,12 @@ def render(df_filtered: pd.DataFrame):
 
     # ---- Date coverage (if available) ----
     st.subheader("🗓️ Coverage")
-    if "date" in df.columns:
-        date_series = _parse_date(df["date"])
-        if date_series is not None and date_series.notna().any():
+    date = profile.column("date")
+    if date is not None:
+        if date.kind == "datetime" and date.min is not None:
+            stats = date.stats()
             st.markdown(
-                f"- **Date Range**: `{date_series.min().date()}` → `{date_series.max().date()}`"
+                f"- **Date Range**: `{stats['min'].date()}` → `{stats['max'].date()}`"
             )
         else:
             st.markdown("- **Date Range**: (unparseable date format)")
@@ -71,15 +63,26 @@ def render(df_filtered: pd.DataFrame):
 
     # ---- Shape & dtypes ----
     st.subheader("📈 Shape & Data Types")
-    st.markdown(f"- 🔢 **Rows**: `{df_filtered.shape[0]:,}`")
-    st.markdown(f"- 📊 **Columns**: `{df_filtered.shape[1]}`")
+    st.markdown(f"- 🔢 **Rows**: `{profile.rows:,}`")
+    st.markdown(f"- 📊 **Columns**: `{len(profile.columns)}`")
+    mem = df_filtered.attrs.get("memory_mb")
+    if mem:
+        st.markdown(
+            f"- 💾 **Memory**: `{mem['after']:.2f} MB` "
+            f"(raw CSV dtypes: `{mem['before']:.2f} MB`, {mem['before'] / mem['after']:.1f}× smaller)"
+        )
     st.write(df_filtered.dtypes)
 
     # ---- Descriptive statistics (numeric only) ----
     st.subheader("📊 Descriptive Statistics (Numeric)")
-    numeric_cols = df_filtered.select_dtypes(include="number")
-    if not numeric_cols.empty:
-        st.dataframe(numeric_cols.describe().T.style.format(precision=2), use_container_width=True)
+    numeric_stats = profile.describe()
+    if not numeric_stats.empty:
+        st.dataframe(numeric_stats.style.format(precision=2), use_container_width=True)
+        st.caption(
+            "Moments (mean, std, skew, kurtosis) are exact; quartiles come from a quantile sketch "
+            "and distinct counts from HyperLogLog once a column is large, so both may be "
+            "approximate for big files."
+        )
     else:
         st.info("No numeric columns found for descriptive statistics.")
 
@@ -1,43 +1,106 @@
 import streamlit as st
-import pandas as pd
 
-def render(df):
+from core.data_quality import IQR_K, MAD_Z, check_frame
+from core.profiler import DatasetProfile
+
+
+def render(df, profile=None, quality=None):
     st.header("🧹 Data Cleaning & Preprocessing — King County House Sales")
 
+    # Ranges, distinct counts and top values from the one-pass profile (core/profiler.py)
+    if profile is None:
+        profile = DatasetProfile.from_frame(df)
+
     # Phase 1: Value Ranges
     st.subheader("📊 Phase 1: Value Ranges of Numeric Features")
-    numeric_features = df.select_dtypes(include=['number'])
-    min_values = numeric_features.min()
-    max_values = numeric_features.max()
-    min_max_df = pd.DataFrame({'Min Value': min_values, 'Max Value': max_values})
+    min_max_df = profile.describe()[["min", "max"]].rename(columns={"min": "Min Value", "max": "Max Value"})
     st.dataframe(min_max_df.style.format(precision=2), use_container_width=True)
 
     # Phase 2: Unique Values
     st.subheader("🔣 Phase 2: Unique Values in Categorical Features")
-    categorical_features = df.select_dtypes(include=['object', 'category'])
-    for col in categorical_features.columns:
-        st.markdown(f"**📝 {col}**: {df[col].nunique()} unique value(s)")
-        st.write(sorted(df[col].dropna().unique()))
+    categorical = {name: c for name, c in profile.columns.items() if c.kind == "categorical"}
+    for col, column in categorical.items():
+        distinct = column.distinct.estimate()
+        approx = "" if column.distinct.exact else "≈ "
+        st.markdown(f"**📝 {col}**: {approx}{distinct:,} unique value(s)")
+        # The most frequent values, not a dump of every level (ids would be ~21k)
+        top = column.top_values.top(10)
+        st.dataframe(
+            top.rename("Rows").rename_axis(col).reset_index(),
+            hide_index=True,
+        )
+        if distinct > len(top):
+            st.caption(f"Showing the {len(top)} most frequent of {approx}{distinct:,} values.")
+        if column.top_values.error:
+            st.caption(f"Counts are lower bounds, each at most {column.top_values.error:,} short.")
+
+    # Phases 3-4 render the findings of core/data_quality.py, the same
+    # checks that gate new sales and batch files before they reach the model
+    if quality is None:
+        quality = check_frame(df)
+    findings = quality.table()
 
     # Phase 3: Missing Values
-    st.subheader("🧪 Phase 3: Missing Values Check")
-    st.success("✅ The dataset contains NO missing values and NO duplicate rows.\n"
-               "This indicates that the dataset is complete and unique for all records.")
+    st.subheader("🧪 Phase 3: Missing Values & Duplicates Check")
+    missing = findings[findings["check"].isin(["missing", "missing_column"])]
+    if missing.empty:
+        st.success(f"✅ No missing values in any of the {len(profile.columns)} columns.")
+    else:
+        st.warning(f"⚠️ {int(missing['rows'].sum()):,} missing value(s) found.")
+        st.dataframe(missing[["column", "rows", "share"]].style.format({"share": "{:.2%}"}), hide_index=True)
+
+    duplicate_sales = quality.count("duplicate_sale")
+    if duplicate_sales:
+        st.error(f"❌ {duplicate_sales:,} duplicate sale(s): same `id` sold on the same date more than once.")
+    else:
+        st.success("✅ No duplicate sales: every (`id`, `date`) pair is unique.")
+    repeat_sales = quality.count("repeat_sale")
+    if repeat_sales:
+        st.info(
+            f"ℹ️ {repeat_sales:,} sale(s) are repeat sales of a house already sold earlier in the file "
+            "(same `id`, another date). They are separate transactions and are kept."
+        )
 
     # Phase 4: Outlier Validation
     st.subheader("📏 Phase 4: Outlier Validation")
-    st.markdown("""
-    - **price**: Max $7.7M → realistic for luxury waterfront mansions.  
-    - **bathrooms**: Max 8.0 → plausible for large estates.  
-    - **sqft_living**: Max 13,540 sqft → large mansions exist.  
-    - **sqft_lot**: Max 1.65M sqft (~38 acres) → valid for rural estates.  
-    - **floors**: Max 3.5 → half-level floors are possible.  
-    - **view**, **condition**, **grade**: All within defined categorical scales.  
-    - **sqft_above** & **sqft_basement**: Large but possible in very big homes.  
-    - **yr_renovated**: Max 2015 → fits the dataset period.  
-    - **sqft_living15** & **sqft_lot15**: Valid for neighborhoods with large lots.  
+    out_of_range = findings[findings["check"] == "out_of_range"]
+    if out_of_range.empty:
+        st.success("✅ Every value lies within its documented domain (`core/schema.py`).")
+    else:
+        st.error("❌ Values outside their documented domain:")
+        st.dataframe(out_of_range[["column", "rows", "description", "examples"]], hide_index=True)
 
-    **Conclusion:** All detected extremes are plausible — no removal needed.
-    """)
+    st.markdown("**Cross-column consistency**")
+    if not quality.count("sqft_mismatch"):
+        st.markdown("- `sqft_above + sqft_basement = sqft_living` holds for every house.")
+    consistency = findings[findings["check"].isin(
+        ["sqft_mismatch", "renovated_before_built", "cramped_bedrooms", "sold_before_built"]
+    )]
+    if not consistency.empty:
+        st.dataframe(consistency[["severity", "check", "rows", "description", "examples"]], hide_index=True)
 
+    st.markdown(f"**Statistical outliers** (Tukey fences, k = {IQR_K:g}; modified z-score > {MAD_Z:g})")
+    outliers = findings[findings["check"].isin(["iqr_outlier", "mad_outlier"])]
+    if outliers.empty:
+        st.markdown("- No statistical outliers.")
+    else:
+        counts = outliers.pivot_table(index="column", columns="check", values="rows", fill_value=0)
+        counts = counts.rename(columns={"iqr_outlier": "IQR outliers", "mad_outlier": "MAD outliers"})
+        fences = outliers[outliers["check"] == "iqr_outlier"].set_index("column")["description"]
+        counts["Max Value"] = [profile.column(c).stats()["max"] for c in counts.index]
+        counts["Fences"] = fences.str.extract(r"(\[.*\])", expand=False).reindex(counts.index)
+        st.dataframe(counts.sort_values("IQR outliers", ascending=False).style.format(precision=0),
+                     use_container_width=True)
 
+    iqr_rows = quality.count("iqr_outlier")
+    if quality.ok:
+        st.markdown(
+            f"**Conclusion:** no row breaks a documented domain or a cross-column rule. "
+            f"The {iqr_rows:,} statistical outlier flags mark plausible extremes (luxury homes, "
+            f"rural lots) and are kept — no removal needed."
+        )
+    else:
+        st.markdown(
+            f"**Conclusion:** {quality.rejected:,} of {quality.rows:,} rows fail at least one "
+            f"error-level check; new data like this is rejected before it reaches the model."
+        )
@@ -1,10 +1,9 @@
 import streamlit as st
-import pandas as pd
-from tabs import (
-    general_insights,
-    numrecial_analysis,
-    geospatial_visualizations,
-)
+from core.app_data import get_correlations, get_feature_dataset, get_figure_scope, get_filtered
+from core.page_loading import PageTimer, is_open, lazy_tabs, render_if_open
+from tabs import filters_sidebar
+
+timer = PageTimer("pages/Dashboard.py")
 
 
 #  Page title
@@ -12,23 +11,28 @@ st.set_page_config(page_title="🏡 King County House Sales Dashboard", layout="
 st.title("🏡 King County House Sales Dashboard")
 
 # Get filtered dataframe
-df_filtered = pd.read_csv("data/kc_house_data.csv")
+df_all = get_feature_dataset()
+filters = filters_sidebar.render(df_all)
+df_filtered, cube = get_filtered(filters)
+figures = get_figure_scope(filters)
+
+st.caption(f"Showing **{len(df_filtered):,}** of {len(df_all):,} sales")
+if df_filtered.empty:
+    st.warning("No sales match the current filters.")
+    st.stop()
 
 
-# Create tabs
-tab0, tab1, tab2 = st.tabs([
+# Create tabs; only the selected one is imported and computed on each run
+tab0, tab1, tab2 = lazy_tabs([
     "📊 General Insights",
     "🌍 Numerical Analysis",
     "🗺️ Geospatial Visualizations",
-])
-
-# Render each tab content
-with tab0:
-    general_insights.render(df_filtered)
-
-with tab1:
-    numrecial_analysis.render(df_filtered)
+], key="dashboard_tab")
 
-with tab2:
-    geospatial_visualizations.render(df_filtered)
+# Render the open tab's content
+render_if_open(tab0, "tabs.general_insights", df_filtered, cube, figures, timer=timer)
+correlations = get_correlations(filters) if is_open(tab1) else None
+render_if_open(tab1, "tabs.numrecial_analysis", df_filtered, cube, figures, correlations, timer=timer)
+render_if_open(tab2, "tabs.geospatial_visualizations", df_filtered, figures, timer=timer)
 
+timer.finish()
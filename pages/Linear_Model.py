@@ -1,50 +1,78 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, PolynomialFeatures
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import Ridge
-from sklearn.metrics import r2_score
+import plotly.express as px
+import plotly.graph_objects as go
+from core import batch_scoring, engines, incremental, model_registry, model_selection, ridge_model
+from core.app_data import get_comps_index, get_feature_dataset, get_fingerprint, get_quality_rules
+from core.compiled_predictor import compile_model
+from core.features import FEATURES
+from core.page_loading import PageTimer
+from core.training_jobs import TrainingJobRunner
 
 # ---------------------------
 # Cache data and model training
 # ---------------------------
-@st.cache_data
 def load_data():
-    df = pd.read_csv("data/kc_house_data.csv")
-    df["age_of_house"] = df['yr_built'].max() - df['yr_built']
-    return df
+    df = get_feature_dataset()
+    # age_of_house is the only shared derived feature the model uses
+    return df.drop(columns=[c for c in FEATURES if c != "age_of_house"])
 
 @st.cache_resource
-def train_model(df):
-    drop_cols = [c for c in ["id", "date", "price", "yr_built"] if c in df.columns]
-    X = df.drop(columns=drop_cols)
-    y = df["price"]
+def get_job_runner():
+    # One training pool per app process, shared by every session
+    return TrainingJobRunner()
 
-    if "zipcode" in X.columns:
-        X = pd.get_dummies(X, columns=["zipcode"], drop_first=True)
+@st.cache_resource(show_spinner="Loading price model...")
+def load_model(key, engine_name):
+    if engine_name != ridge_model.ENGINE:
+        model, meta = model_registry.load(key)
+        return model, engines.get_engine(engine_name).compile(model), meta
+    # Registered artifact (see core/model_registry.py), or the newest
+    # incremental update built on it
+    model, meta = incremental.latest_incremental(key) or model_registry.load(key)
+    # Compiled quadratic-form scorer for the form; parity-checked against the
+    # full model on a sample of the training data before it is served
+    sample = ridge_model.model_frame(load_data()).sample(2000, random_state=0)
+    predictor = compile_model(model, check_frame=sample)
+    return model, predictor, meta
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+def last_good_model_key(fingerprint, engine):
+    # Newest fully trained artifact of this engine, preferring the current data version
+    base = [m for m in model_registry.list_artifacts()
+            if m.get("engine") == engine.name and "base_key" not in m
+            and m["params"].get("engine_version") == engine.version]
+    base.sort(key=lambda m: m["data_fingerprint"] == fingerprint, reverse=True)
+    return base[0]["key"] if base else None
 
-    poly = PolynomialFeatures(degree=2, include_bias=True)
-    X_poly = poly.fit_transform(X_scaled)
+@st.fragment(run_every=1.0)
+def training_progress(key, engine_name, params):
+    # Polls the background job; a finished job reruns the page to hot-swap the model
+    status = get_job_runner().status(key)
+    if status is None or status["state"] == "done":
+        st.rerun()
+    elif status["state"] == "failed":
+        st.error(f"❌ Training `{key}` failed: {status['message']}")
+        # Failed fits are not resubmitted on rerun, only on an explicit retry
+        if st.button("🔁 Retry training", key=f"retry_{key}"):
+            get_job_runner().submit(key, engine_name, load_data(), get_fingerprint(), params, retry=True)
+    else:
+        st.progress(status["progress"], text=f"Training model `{key}` — {status['message']}")
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_poly, y, test_size=0.2, random_state=42
-    )
-
-    lr = Ridge(alpha=10.0, random_state=42, max_iter=5000)
-    lr.fit(X_train, y_train)
-
-    train_r2 = r2_score(y_train, lr.predict(X_train))
-    test_r2 = r2_score(y_test, lr.predict(X_test))
+@st.cache_data(show_spinner="Cross-validating the Ridge path...")
+def cv_curve(fingerprint, n_folds):
+    return model_selection.cross_validate_alphas(load_data(), n_folds=n_folds)
 
-    return lr, scaler, poly, X.columns, train_r2, test_r2
+@st.cache_data(show_spinner="Cross-validating every engine...")
+def engine_comparison(fingerprint, alpha):
+    return engines.compare_engines(load_data(), params={ridge_model.ENGINE: {"alpha": alpha}})
 
 # ---------------------------
 # Page configuration
 # ---------------------------
 st.set_page_config(page_title="🏡 King County House Sales", layout="wide")
+timer = PageTimer("pages/Linear_Model.py")
 st.title("🏡 King County House Sales Dashboard")
 st.markdown(
     "This dashboard explores **house sales data** in King County (Seattle area) "
@@ -52,18 +80,102 @@ st.markdown(
 )
 
 # ---------------------------
-# Load and train
+# Load the model; train in the background when it is missing
 # ---------------------------
 df_filtered = load_data()
-lr, scaler, poly, feature_cols, train_r2, test_r2 = train_model(df_filtered)
+if "ridge_alpha" not in st.session_state:
+    st.session_state["ridge_alpha"] = ridge_model.DEFAULT_PARAMS["alpha"]
+
+st.subheader("🤖 Price Forecasting Model")
+engine_name = st.selectbox(
+    "Model engine", list(engines.ENGINES), key="model_engine",
+    format_func=lambda name: engines.ENGINES[name].label,
+)
+engine = engines.get_engine(engine_name)
+params = {"alpha": st.session_state["ridge_alpha"]} if engine_name == ridge_model.ENGINE else {}
+wanted_key = engine.artifact_key(get_fingerprint(), params)
+
+if model_registry.exists(wanted_key):
+    served_key = wanted_key
+else:
+    # Keep serving the last good model while the requested one trains
+    get_job_runner().submit(wanted_key, engine_name, df_filtered, get_fingerprint(), params)
+    served_key = last_good_model_key(get_fingerprint(), engine)
+    training_progress(wanted_key, engine_name, params)
+    if served_key is None:
+        st.info("No trained model yet — predictions will be available when training finishes.")
+        st.stop()
+    st.caption(f"Serving the previous model `{served_key}` until training finishes.")
+model, predictor, model_meta = load_model(served_key, engine_name)
 
 # ---------------------------
 # Model performance
 # ---------------------------
-st.subheader("🤖 Price Forecasting Model")
 c1, c2 = st.columns(2)
-c1.metric("Train R²", f"{train_r2:.4f}")
-c2.metric("Test R²",  f"{test_r2:.4f}")
+c1.metric("Train R²", f"{model_meta['train_r2']:.4f}")
+c2.metric("Test R²",  f"{model_meta['test_r2']:.4f}" if model_meta['test_r2'] is not None else "— (incremental)")
+st.caption(
+    f"Model version `{model_meta['key']}` · trained {model_meta['created_at']} "
+    f"in {model_meta['train_seconds']:.2f}s on {model_meta['n_rows']:,} sales · {engine.label}"
+    + (f" · α = {model_meta['params']['alpha']:g}" if "alpha" in model_meta["params"] else "")
+    + (f" · {len(model_meta['batches']) - 1} incremental batch(es)" if "batches" in model_meta else "")
+)
+
+# ---------------------------
+# Engine comparison
+# ---------------------------
+with st.expander("⚖️ Engine Comparison"):
+    st.markdown(
+        "Every engine is cross-validated on the same folds, each in its own process. "
+        "Predict latency is the median time to price one house the way the form does; "
+        "serving size is what has to be held in memory to answer requests."
+    )
+    if st.button("Compare Engines"):
+        st.session_state["compare_engines"] = True
+    if st.session_state.get("compare_engines"):
+        comparison = engine_comparison(get_fingerprint(), st.session_state["ridge_alpha"])
+        st.dataframe(
+            comparison.drop(columns="engine").rename(columns={
+                "label": "Engine", "cv_r2": "CV R²", "cv_r2_std": "R² std", "cv_mae": "MAE ($)",
+                "fit_seconds": "Fit (s)", "predict_us": "Predict (µs)",
+                "model_kb": "Stored (KB)", "serving_kb": "Serving (KB)",
+            }).style.format(precision=4, thousands=","),
+            hide_index=True, use_container_width=True,
+        )
+        fig = px.scatter(
+            comparison, x="predict_us", y="cv_r2", text="label", log_x=True,
+            size="fit_seconds", size_max=30,
+            labels={"predict_us": "Single-row predict latency (µs)", "cv_r2": "CV R²"},
+            title="Accuracy vs serving cost",
+        )
+        fig.update_traces(textposition="top center")
+        st.plotly_chart(fig, use_container_width=True)
+
+# ---------------------------
+# Model selection (Ridge alpha)
+# ---------------------------
+if engine_name == ridge_model.ENGINE:
+    with st.expander("🎛️ Model Selection — Ridge α"):
+        st.markdown(
+            "k-fold cross-validation over the whole regularization path. Each fold is "
+            "solved for every α from one eigendecomposition, with folds run in parallel processes."
+        )
+        n_folds = st.slider("Folds", 3, 10, model_selection.DEFAULT_FOLDS)
+        if st.button("Run Cross-Validation"):
+            st.session_state["cv_folds"] = n_folds
+        if "cv_folds" in st.session_state:
+            curve = cv_curve(get_fingerprint(), st.session_state["cv_folds"])
+            best = model_selection.best_alpha(curve)
+            fig = px.line(
+                curve, x="alpha", y="cv_r2", error_y="cv_r2_std", log_x=True, markers=True,
+                title=f"{st.session_state['cv_folds']}-fold CV R² by α (best α = {best:g})",
+            )
+            fig.add_vline(x=best, line_dash="dash", line_color="green")
+            fig.add_vline(x=st.session_state["ridge_alpha"], line_dash="dot", line_color="gray")
+            st.plotly_chart(fig, use_container_width=True)
+            if best != st.session_state["ridge_alpha"] and st.button(f"Use α = {best:g}"):
+                st.session_state["ridge_alpha"] = best
+                st.rerun()
 
 # ---------------------------
 # Prediction form
@@ -87,13 +199,13 @@ long            = st.number_input("Longitude", value=-122.2)
 sqft_living15   = st.number_input("Sqft Living 15", min_value=0, value=1800)
 sqft_lot15      = st.number_input("Sqft Lot 15", min_value=0, value=4000)
 year_built      = st.number_input("Year Built", min_value=1900, max_value=2015, value=2000)
-age_of_house    = df_filtered['yr_built'].max() - year_built
+age_of_house    = int(df_filtered['yr_built'].max()) - year_built
 
 zip_choices = sorted(df_filtered['zipcode'].unique().tolist())
 zipcode_val = st.selectbox("Zipcode", zip_choices)
 
 # Build input row
-input_df = pd.DataFrame([{
+input_row = {
     "bedrooms": bedrooms,
     "bathrooms": bathrooms,
     "sqft_living": sqft_living,
@@ -112,16 +224,154 @@ input_df = pd.DataFrame([{
     "sqft_lot15": sqft_lot15,
     "age_of_house": age_of_house,
     "zipcode": zipcode_val
-}])
+}
 
-# Match training features
-if "zipcode" in input_df.columns:
-    input_df = pd.get_dummies(input_df, columns=["zipcode"], drop_first=True)
-input_df = input_df.reindex(columns=feature_cols, fill_value=0)
+with st.expander("🏘️ Comparable sales settings"):
+    comps_k = st.slider("Number of comps", 3, 30, 10)
+    comps_radius = st.number_input("Max distance (km, 0 = no limit)", min_value=0.0, value=0.0, step=0.5)
+    match_grade = st.checkbox("Match grade (±1)", value=True)
+    match_bedrooms = st.checkbox("Match bedrooms (±1)", value=True)
 
-# Transform & predict
+# Predict with the selected engine's serving form (compiled scorer for the Ridge)
 if st.button("Predict Price"):
-    input_scaled = scaler.transform(input_df)
-    input_poly = poly.transform(input_scaled)
-    pred = lr.predict(input_poly)[0]
-    st.success(f"💵 Estimated Price: ${pred:,.0f}")
+    pred = predictor.predict_one(input_row)
+    st.success(f"💵 Estimated Price: ${pred:,.0f} ({engine.label})")
+
+    # Why this price: each input's share, interactions split between their inputs
+    if hasattr(predictor, "explain"):
+        base, main, interaction = predictor.explain(pd.DataFrame([input_row]))
+        breakdown = pd.DataFrame({"own": main.iloc[0], "interactions": interaction.iloc[0]})
+        breakdown["total"] = breakdown["own"] + breakdown["interactions"]
+        breakdown = breakdown.reindex(breakdown["total"].abs().sort_values(ascending=False).index)
+        top, rest = breakdown.iloc[:10], breakdown.iloc[10:]
+        labels = ["Average house"] + top.index.tolist() + (["Other inputs"] if len(rest) else []) + ["Estimate"]
+        values = [base] + top["total"].tolist() + ([rest["total"].sum()] if len(rest) else []) + [pred]
+        fig = go.Figure(go.Waterfall(
+            x=labels, y=values,
+            measure=["absolute"] + ["relative"] * (len(values) - 2) + ["total"],
+            text=[f"${v:,.0f}" for v in values], textposition="outside",
+            increasing={"marker": {"color": "#2ca02c"}}, decreasing={"marker": {"color": "#d62728"}},
+        ))
+        fig.update_layout(title="How the estimate is built up", yaxis_title="Price ($)", showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "Contributions are relative to a house with average inputs in an average zipcode. "
+            "Interaction terms (e.g. sqft_living × grade) are split evenly between their two inputs."
+        )
+        st.dataframe(breakdown.style.format("${:,.0f}"), use_container_width=True)
+    else:
+        st.caption(f"Price breakdowns are available for the {engines.ENGINES[ridge_model.ENGINE].label} engine.")
+
+    # Nearest comparable sales from the spatial index (see core/comps.py)
+    comps = get_comps_index().query(
+        lat, long, k=comps_k, radius_km=comps_radius or None,
+        grade=grade if match_grade else None, grade_tolerance=1,
+        bedrooms=bedrooms if match_bedrooms else None, bedrooms_tolerance=1,
+    )
+    st.markdown("#### 🏘️ Comparable Sales")
+    if comps.empty:
+        st.info("No comparable sales match these criteria; widen the distance or matching.")
+    else:
+        c1, c2 = st.columns(2)
+        c1.metric("Median comp price", f"${comps['price'].median():,.0f}",
+                  delta=f"{pred / comps['price'].median() - 1:+.1%} model vs comps", delta_color="off")
+        c2.metric("Median comp $/sqft", f"${(comps['price'] / comps['sqft_living']).median():,.0f}")
+        st.dataframe(comps, hide_index=True, use_container_width=True)
+
+# ---------------------------
+# Batch scoring
+# ---------------------------
+st.subheader("📦 Batch Price Scoring")
+st.markdown(
+    "Upload a CSV with the same columns as the dataset to price every row. "
+    "The file is scored in chunks, so large portfolios keep memory bounded. "
+    "For very large files use `python -m core.batch_scoring input.csv output.csv`."
+)
+uploaded = st.file_uploader("Houses CSV", type="csv")
+explain_batch = st.checkbox(
+    "Add each input's contribution to the price (contrib_* columns)",
+    disabled=not hasattr(predictor, "explain"),
+)
+if uploaded is not None and st.button("Score File"):
+    progress_bar = st.progress(0.0, text="Scoring...")
+    total_bytes = max(uploaded.size, 1)
+
+    def report(rows, seconds):
+        done = min(uploaded.tell() / total_bytes, 1.0)
+        progress_bar.progress(done, text=f"{rows:,} rows · {rows / max(seconds, 1e-9):,.0f} rows/s")
+
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as out_file:
+        out_path = out_file.name
+    try:
+        stats = batch_scoring.score_csv(
+            uploaded, out_path, predictor, model_meta["reference_year"], progress=report,
+            explain=explain_batch, rules=get_quality_rules(),
+        )
+    except ValueError as err:
+        progress_bar.empty()
+        st.error(f"❌ {err}")
+    else:
+        progress_bar.progress(1.0, text="Done")
+        st.success(
+            f"✅ Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+            f"({stats['rows_per_second']:,} rows/s)"
+        )
+        quality = stats["quality"]
+        if quality.rejected:
+            st.warning(
+                f"⚠️ {quality.rejected:,} row(s) failed the data-quality checks and were not priced "
+                f"(`{batch_scoring.REJECTED_COLUMN}` column)."
+            )
+            st.dataframe(quality.table(severities=("error", "warning")), hide_index=True)
+        with open(out_path, "rb") as fh:
+            st.download_button(
+                "⬇️ Download priced CSV", fh.read(),
+                file_name=f"priced_{uploaded.name}", mime="text/csv",
+            )
+    finally:
+        os.remove(out_path)
+
+# ---------------------------
+# Incremental update
+# ---------------------------
+if engine_name == ridge_model.ENGINE:
+    st.subheader("➕ Add New Sales")
+    st.markdown(
+        "Append newly recorded sales (same columns as the dataset, including `price`). "
+        "The model's sufficient statistics are updated with just the new rows and re-solved, "
+        "giving the same model as a full refit on all sales."
+    )
+    st.caption(
+        "New sales pass the data-quality checks first: rows with missing inputs, out-of-range values, "
+        "inconsistent square footage or a sale already in the dataset are left out."
+    )
+    new_sales_file = st.file_uploader("New sales CSV", type="csv", key="new_sales")
+    last_quality = model_meta.get("quality")
+    if last_quality and last_quality["rejected"]:
+        with st.expander(
+            f"⚠️ Last update left out {last_quality['rejected']:,} of {last_quality['checked']:,} sales"
+        ):
+            st.dataframe(pd.DataFrame(last_quality["findings"]), hide_index=True)
+    if new_sales_file is not None and st.button("Update Model"):
+        new_sales = pd.read_csv(new_sales_file)
+        new_sales.columns = [c.strip().lower() for c in new_sales.columns]
+        if "yr_built" in new_sales.columns:
+            new_sales["age_of_house"] = model_meta["reference_year"] - new_sales["yr_built"]
+        try:
+            with st.spinner("Updating model..."):
+                _, new_meta = incremental.append_sales(
+                    load_data(), get_fingerprint(), new_sales,
+                    alpha=st.session_state["ridge_alpha"], label=new_sales_file.name,
+                    rules=get_quality_rules(),
+                )
+        except ValueError as err:
+            st.error(f"❌ {err}")
+        else:
+            load_model.clear()
+            st.success(
+                f"✅ Model `{new_meta['key']}` now covers {new_meta['n_rows']:,} sales "
+                f"(updated in {new_meta['train_seconds']:.2f}s)"
+            )
+            st.rerun()
+
+timer.finish()
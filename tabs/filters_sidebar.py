@@ -0,0 +1,38 @@
+# tabs/filters_sidebar.py
+import streamlit as st
+
+
+def render(df):
+    """Render the Dashboard's global filters and return them as a filters dict."""
+    st.sidebar.header("🔎 Filters")
+    filters = {}
+
+    # Zipcode (empty selection = all)
+    zip_choices = sorted(df['zipcode'].unique().tolist())
+    zips = st.sidebar.multiselect("Zipcode", zip_choices, placeholder="All zipcodes")
+    filters['zipcode'] = zips or None
+
+    # Sale date range
+    first, last = df['date'].min().date(), df['date'].max().date()
+    dates = st.sidebar.date_input("Sale date", (first, last), min_value=first, max_value=last)
+    if isinstance(dates, (tuple, list)) and len(dates) == 2 and tuple(dates) != (first, last):
+        filters['date'] = tuple(dates)
+
+    # Price range
+    lo, hi = int(df['price'].min()), int(df['price'].max())
+    price = st.sidebar.slider("Price ($)", lo, hi, (lo, hi), step=5000)
+    if price != (lo, hi):
+        filters['price'] = price
+
+    # Grade
+    g_lo, g_hi = int(df['grade'].min()), int(df['grade'].max())
+    grade = st.sidebar.slider("Grade", g_lo, g_hi, (g_lo, g_hi))
+    if grade != (g_lo, g_hi):
+        filters['grade'] = list(range(grade[0], grade[1] + 1))
+
+    # Waterfront
+    waterfront = st.sidebar.radio("Waterfront", ["All", "Yes", "No"], horizontal=True)
+    if waterfront != "All":
+        filters['waterfront'] = [1 if waterfront == "Yes" else 0]
+
+    return filters
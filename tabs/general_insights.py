@@ -1,8 +1,11 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
+from core.aggregates import AggregateCube
+from core.density import DENSITY_ROW_THRESHOLD, density_grid, region_mask, use_density
+from core.figure_cache import FigureScope
 
-def render(df_filtered):
+def render(df_filtered, cube=None, figures=None):
     """Render stacked histogram of Life Expectancy by Development Status."""    
     
     # ---- General Insights ----
@@ -21,41 +24,88 @@ def render(df_filtered):
     col3.metric("🏗️ Avg. Grade", f"{df_filtered['grade'].mean():.1f} / 13")
 
     
+    # Group-by charts read precomputed aggregates instead of raw rows
+    if cube is None:
+        cube = AggregateCube.from_frame(df_filtered)
+    if figures is None:
+        figures = FigureScope()
+
     # 1
 
     st.subheader("1: 📊 Price Distribution by Lot Size Category")
 
-    bins = [0, 2000, 4000, 6000, 10000, 20000, df_filtered['sqft_lot'].max()]
-    labels = ['<2k', '2k–4k', '4k–6k', '6k–10k', '10k–20k', '20k+']
-
-    df_filtered['lot_size_range'] = pd.cut(df_filtered['sqft_lot'], bins=bins, labels=labels)
-    lot_avg = df_filtered.groupby('lot_size_range')['price'].mean().reset_index()
-
-    fig = px.bar(
-        lot_avg,
-        x='lot_size_range',
-        y='price',
-        color='price',
-        color_continuous_scale='Blues',
-        text='price',
-        title='Avg Price by Lot Size Category'
-    )
-    fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        lot_avg = cube.mean('lot_size_range')
+
+        fig = px.bar(
+            lot_avg,
+            x='lot_size_range',
+            y='price',
+            color='price',
+            color_continuous_scale='Blues',
+            text='price',
+            title='Avg Price by Lot Size Category'
+        )
+        fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
+        return fig
+    st.plotly_chart(figures.get('gi_lot_size', build), use_container_width=True)
 
     # 2
 
     st.subheader("2: 📈 Sqft Living vs. Price by Grade")
 
-    fig = px.scatter(
-        df_filtered,
-        x='sqft_living',
-        y='price',
-        color='grade',
-        color_continuous_scale='Blues',
-        hover_data=['bedrooms', 'bathrooms', 'zipcode'],
-        title='Sqft Living vs. Price'
-    )
+    # Zoom region: exact points are shown once it holds few enough sales
+    sqft = df_filtered['sqft_living'].to_numpy()
+    price = df_filtered['price'].to_numpy()
+    s_lo, s_hi = int(sqft.min()), int(sqft.max())
+    p_lo, p_hi = int(price.min()), int(price.max())
+    # st.slider rejects min == max (e.g. filters leaving one sale); a
+    # single-valued axis has no slider and the whole view is the region
+    sqft_range, price_range = (s_lo, s_hi), (p_lo, p_hi)
+    if s_lo < s_hi or p_lo < p_hi:
+        with st.expander("🔍 Zoom region"):
+            if s_lo < s_hi:
+                sqft_range = st.slider("Sqft living", s_lo, s_hi, (s_lo, s_hi), key="gi_zoom_sqft")
+            if p_lo < p_hi:
+                price_range = st.slider("Price ($)", p_lo, p_hi, (p_lo, p_hi), step=5000, key="gi_zoom_price")
+    in_region = region_mask(sqft, price, sqft_range, price_range)
+    n_region = int(in_region.sum())
+
+    def build_density():
+        grid = density_grid(
+            sqft[in_region], price[in_region],
+            values=df_filtered['grade'].to_numpy()[in_region],
+            x_range=sqft_range, y_range=price_range,
+        )
+        fig = go.Figure(go.Heatmap(
+            x=grid['x'], y=grid['y'], z=grid['mean'],
+            customdata=grid['count'],
+            colorscale='Blues', colorbar=dict(title='Avg grade'),
+            hovertemplate='sqft %{x:,.0f}<br>$%{y:,.0f}<br>avg grade %{z:.1f}<br>%{customdata:,.0f} sales<extra></extra>',
+        ))
+        fig.update_layout(title='Sqft Living vs. Price (density)', xaxis_title='sqft_living', yaxis_title='price')
+        return fig
+
+    def build_points():
+        return px.scatter(
+            df_filtered[in_region],
+            x='sqft_living',
+            y='price',
+            color='grade',
+            color_continuous_scale='Blues',
+            hover_data=['bedrooms', 'bathrooms', 'zipcode'],
+            title='Sqft Living vs. Price'
+        )
+
+    if use_density(n_region):
+        # Density mode: bin on the server and ship only the grid
+        fig = figures.get('gi_sqft_price_density', build_density, sqft_range, price_range)
+        st.caption(
+            f"Density mode: {n_region:,} sales binned on the server. "
+            f"Zoom to fewer than {DENSITY_ROW_THRESHOLD:,} sales to see individual points."
+        )
+    else:
+        fig = figures.get('gi_sqft_price', build_points, sqft_range, price_range)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -63,54 +113,57 @@ def render(df_filtered):
 
     st.subheader("3: 🏞️ Avg Price by View Quality")
 
-    view_avg = df_filtered.groupby('view')['price'].mean().reset_index()
-
-    fig = px.bar(
-        view_avg,
-        x='view',
-        y='price',
-        color='price',
-        color_continuous_scale='Blues',
-        text='price',
-        title='Avg Price by View Quality'
-    )
-    fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        view_avg = cube.mean('view')
+
+        fig = px.bar(
+            view_avg,
+            x='view',
+            y='price',
+            color='price',
+            color_continuous_scale='Blues',
+            text='price',
+            title='Avg Price by View Quality'
+        )
+        fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
+        return fig
+    st.plotly_chart(figures.get('gi_view', build), use_container_width=True)
 
 
     # 4
 
     st.subheader("4: 🏚️ Average Price by Condition")
 
-    cond_avg = df_filtered.groupby('condition')['price'].mean().reset_index()
-
-    fig = px.bar(
-        cond_avg,
-        x='condition',
-        y='price',
-        color='price',
-        color_continuous_scale='Blues',
-        text='price',
-        title='Average Price by Condition'
-    )
-    fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        cond_avg = cube.mean('condition')
+
+        fig = px.bar(
+            cond_avg,
+            x='condition',
+            y='price',
+            color='price',
+            color_continuous_scale='Blues',
+            text='price',
+            title='Average Price by Condition'
+        )
+        fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
+        return fig
+    st.plotly_chart(figures.get('gi_condition', build), use_container_width=True)
 
 
     # 5
 
     st.subheader("5: 🛠️ Avg Price — Renovated vs Not Renovated")
 
-    df_filtered['was_renovated'] = df_filtered['yr_renovated'].apply(lambda x: 'Yes' if x > 0 else 'No')
-
-    fig = px.histogram(
-        df_filtered,
-        x='was_renovated',
-        y='price',
-        histfunc='avg',
-        color='was_renovated',
-        title='Avg Price: Renovated vs Not Renovated'
-    )
-
-    fig.update_layout(showlegend=False)
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        fig = px.bar(
+            cube.mean('was_renovated'),
+            x='was_renovated',
+            y='price',
+            color='was_renovated',
+            title='Avg Price: Renovated vs Not Renovated'
+        )
+
+        fig.update_layout(showlegend=False)
+        return fig
+    st.plotly_chart(figures.get('gi_renovated', build), use_container_width=True)
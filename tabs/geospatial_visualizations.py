@@ -2,56 +2,59 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
-import folium
-import branca.colormap as cm
-from streamlit_folium import st_folium
-
-def render(df_filtered):
-    
+from core.app_data import get_comps_index, get_hex_index
+from core.density import DENSITY_ROW_THRESHOLD, density_cells, region_mask, use_density
+from core.figure_cache import FigureScope
+
+def render(df_filtered, figures=None):
+    if figures is None:
+        figures = FigureScope()
+
     st.header("🗺️ Geospatial Visualizations")
 
 
+    def build_condition():
         # Group by zipcode and calculate average condition + lat/long
-    zip_condition = df_filtered.groupby('zipcode').agg({
-        'lat': 'mean',
-        'long': 'mean',
-        'condition': 'mean'
-    }).reset_index().rename(columns={'condition': 'avg_condition'})
-
-    # Create condition categories
-    bins = [0, 1.5, 2.5, 3.5, 4.5, 5.1]
-    labels = ['Poor', 'Fair', 'Average', 'Good', 'Excellent']
-    zip_condition['condition_category'] = pd.cut(
-        zip_condition['avg_condition'],
-        bins=bins,
-        labels=labels,
-        include_lowest=True
-    )
+        zip_condition = df_filtered.groupby('zipcode').agg({
+            'lat': 'mean',
+            'long': 'mean',
+            'condition': 'mean'
+        }).reset_index().rename(columns={'condition': 'avg_condition'})
+
+        # Create condition categories
+        bins = [0, 1.5, 2.5, 3.5, 4.5, 5.1]
+        labels = ['Poor', 'Fair', 'Average', 'Good', 'Excellent']
+        zip_condition['condition_category'] = pd.cut(
+            zip_condition['avg_condition'],
+            bins=bins,
+            labels=labels,
+            include_lowest=True
+        )
+
+        # 1
+        fig_condition = px.scatter_mapbox(
+            zip_condition,
+            lat="lat",
+            lon="long",
+            size="avg_condition",
+            color="condition_category",
+            hover_name="zipcode",
+            hover_data={"avg_condition": True, "condition_category": True},
+            color_discrete_sequence=px.colors.qualitative.Set2,
+            size_max=15,
+            zoom=9,
+            mapbox_style="carto-positron",
+        )
+
+        # Adjust map size
+        fig_condition.update_layout(
+            width=1200,
+            height=700
+        )
+        return fig_condition
 
-    # 1
-    fig_condition = px.scatter_mapbox(
-        zip_condition,
-        lat="lat",
-        lon="long",
-        size="avg_condition",
-        color="condition_category",
-        hover_name="zipcode",
-        hover_data={"avg_condition": True, "condition_category": True},
-        color_discrete_sequence=px.colors.qualitative.Set2,
-        size_max=15,
-        zoom=9,
-        mapbox_style="carto-positron",
-    )
-
-    # Adjust map size
-    fig_condition.update_layout(
-        width=1200,
-        height=700
-    )
     st.subheader("1: 🗺️ Map of Binned Average House Condition by Zipcode")
-    st.plotly_chart(fig_condition, use_container_width=False)
+    st.plotly_chart(figures.get('geo_condition', build_condition), use_container_width=False)
 
 
 
@@ -60,35 +63,161 @@ def render(df_filtered):
 
 
 
-    # Create geometry points
-    geometry = [Point(xy) for xy in zip(df_filtered['long'], df_filtered['lat'])]
-    geo_df = gpd.GeoDataFrame(df_filtered, geometry=geometry)
-    geo_df.set_crs(epsg=4326, inplace=True)
-
-    # Extract lat/lon for Plotly
-    geo_df_px = geo_df.copy()
-    geo_df_px['lon'] = geo_df_px.geometry.x
-    geo_df_px['lat'] = geo_df_px.geometry.y
+    # Plotly only needs the coordinate arrays; no geometry objects are built
+    lon = df_filtered['long'].to_numpy()
+    lat = df_filtered['lat'].to_numpy()
+
+    # Zoom region: exact points are shown once it holds few enough sales
+    lat_lo, lat_hi = float(lat.min()), float(lat.max())
+    lon_lo, lon_hi = float(lon.min()), float(lon.max())
+    # st.slider rejects min == max (e.g. filters leaving one sale); a
+    # single-valued axis has no slider and the whole view is the region
+    lat_range, lon_range = (lat_lo, lat_hi), (lon_lo, lon_hi)
+    if lat_lo < lat_hi or lon_lo < lon_hi:
+        with st.expander("🔍 Zoom region"):
+            if lat_lo < lat_hi:
+                lat_range = st.slider("Latitude", lat_lo, lat_hi, (lat_lo, lat_hi), step=0.005, key="geo_zoom_lat")
+            if lon_lo < lon_hi:
+                lon_range = st.slider("Longitude", lon_lo, lon_hi, (lon_lo, lon_hi), step=0.005, key="geo_zoom_lon")
+    in_region = region_mask(lon, lat, lon_range, lat_range)
+    n_region = int(in_region.sum())
+    center = {"lat": sum(lat_range) / 2, "lon": sum(lon_range) / 2}
+
+    def build_map(density):
+        if density:
+            # Density mode: aggregate onto a raster on the server and plot one marker per cell
+            cells = density_cells(
+                lon[in_region], lat[in_region],
+                values=df_filtered['condition'].to_numpy()[in_region],
+                x_range=lon_range, y_range=lat_range,
+            ).rename(columns={"x": "lon", "y": "lat", "mean": "condition"})
+            fig = px.scatter_mapbox(
+                cells,
+                lat="lat",
+                lon="lon",
+                color="condition",
+                size="count",
+                hover_data={"count": True, "condition": ":.2f"},
+                color_continuous_scale="Viridis",
+                size_max=8,
+                zoom=9,
+                center=center,
+                mapbox_style="carto-positron",
+                title="Map of House Conditions (density)"
+            )
+        else:
+            fig = px.scatter_mapbox(
+                df_filtered[in_region],
+                lat="lat",
+                lon="long",
+                color="condition",
+                color_continuous_scale="Viridis",
+                size_max=8,
+                zoom=9,
+                center=center,
+                mapbox_style="carto-positron",
+                title="Map of House Conditions"
+            )
+
+        # Adjust map size
+        fig.update_layout(
+            width=1200,
+            height=700
+        )
+        return fig
 
     # Plot
-    fig = px.scatter_mapbox(
-        geo_df_px,
-        lat="lat",
-        lon="lon",
-        color="condition",
-        color_continuous_scale="Viridis",
-        size_max=8,
-        zoom=9,
-        mapbox_style="carto-positron",
-        title="Map of House Conditions"
-    )
-
-    # Adjust map size
-    fig.update_layout(
-        width=1200,
-        height=700
-    )
-
+    density = use_density(n_region)
+    fig = figures.get('geo_points', lambda: build_map(density), density, lat_range, lon_range)
+    if density:
+        st.caption(
+            f"Density mode: {n_region:,} sales aggregated into {len(fig.data[0].lat):,} cells. "
+            f"Zoom to fewer than {DENSITY_ROW_THRESHOLD:,} sales to see individual houses."
+        )
     st.plotly_chart(fig, use_container_width=False)
 
 
+
+    # 3
+    st.subheader("3: ⬡ Hexagon Map")
+    hex_index = get_hex_index()
+    # Resolution follows the zoom region above; cells are re-aggregated from
+    # the precomputed assignment for the filtered rows, never re-binned
+    size = hex_index.choose_size(lat_range, lon_range)
+    in_view = hex_index.rows_mask(df_filtered.index[in_region])
+    metric_labels = {
+        "median_price": "Median price",
+        "mean_price": "Mean price",
+        "price_per_sqft": "Price per sqft",
+        "condition": "Mean condition",
+        "count": "Sales",
+    }
+    metric = st.selectbox("Color by", list(metric_labels), format_func=metric_labels.get, key="hex_metric")
+
+    def build_hex():
+        cells = hex_index.aggregate(size, in_view)
+        fig_hex = px.choropleth_mapbox(
+            cells,
+            geojson=hex_index.geojson(size, cells["cell"]),
+            locations="cell",
+            color=metric,
+            hover_data={"cell": False, "count": True, "median_price": ":,.0f",
+                        "price_per_sqft": ":,.0f", "condition": ":.2f"},
+            labels=metric_labels,
+            color_continuous_scale="Viridis",
+            opacity=0.6,
+            zoom=9,
+            center=center,
+            mapbox_style="carto-positron",
+        )
+        fig_hex.update_layout(width=1200, height=700)
+        return fig_hex
+
+    fig_hex = figures.get('geo_hex', build_hex, size, lat_range, lon_range, metric)
+    st.caption(
+        f"{len(fig_hex.data[0].locations):,} hexagons of {size:g} km radius "
+        f"covering {int(in_view.sum()):,} sales."
+    )
+    st.plotly_chart(fig_hex, use_container_width=False)
+
+
+
+    # 4
+    st.subheader("4: 🏘️ Comparable Sales Around a Location")
+    st.caption("Nearest sales from the whole dataset (not only the filtered view), via a spatial index.")
+    c1, c2, c3, c4 = st.columns(4)
+    comp_lat = c1.number_input("Latitude", value=round(float(lat.mean()), 4), format="%.4f", key="comps_lat")
+    comp_lon = c2.number_input("Longitude", value=round(float(lon.mean()), 4), format="%.4f", key="comps_lon")
+    comp_k = c3.slider("Comps", 3, 50, 15, key="comps_k")
+    comp_grade = c4.selectbox("Grade", ["Any"] + list(range(1, 14)), key="comps_grade")
+
+    def build_comps():
+        comps = get_comps_index().query(
+            comp_lat, comp_lon, k=comp_k,
+            grade=None if comp_grade == "Any" else comp_grade,
+        )
+        fig_comps = px.scatter_mapbox(
+            comps,
+            lat="lat",
+            lon="long",
+            color="price",
+            size="sqft_living",
+            hover_data={"price": ":,.0f", "grade": True, "bedrooms": True, "distance_km": True},
+            color_continuous_scale="Viridis",
+            size_max=15,
+            zoom=13,
+            center={"lat": comp_lat, "lon": comp_lon},
+            mapbox_style="carto-positron",
+            title=f"{len(comps)} nearest sales · median ${comps['price'].median():,.0f}",
+        )
+        fig_comps.add_scattermapbox(
+            lat=[comp_lat], lon=[comp_lon], mode="markers", name="Location",
+            marker={"size": 14, "color": "red"},
+        )
+        fig_comps.update_layout(width=1200, height=600)
+        return fig_comps
+
+    st.plotly_chart(
+        figures.get('geo_comps', build_comps, comp_lat, comp_lon, comp_k, comp_grade),
+        use_container_width=False,
+    )
@@ -0,0 +1,22 @@
+# tests/conftest.py
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core.data_loader import parse_csv
+from core.ridge_model import PolyRidgeModel, TARGET, model_frame
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "kc_house_data.csv"
+
+
+@pytest.fixture(scope="session")
+def sales():
+    """A reproducible sample of the dataset with the model's derived inputs."""
+    df = parse_csv(DATA_PATH).sample(5000, random_state=0).reset_index(drop=True)
+    return df.assign(age_of_house=int(df["yr_built"].max()) - df["yr_built"])
+
+
+@pytest.fixture(scope="session")
+def fitted_model(sales):
+    return PolyRidgeModel().fit(model_frame(sales), sales[TARGET].to_numpy(dtype=np.float64))
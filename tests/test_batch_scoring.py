@@ -0,0 +1,32 @@
+# tests/test_batch_scoring.py
+import numpy as np
+
+from core.batch_scoring import PREDICTION_COLUMN, REJECTED_COLUMN, score_stream
+from core.compiled_predictor import CompiledPredictor
+from core.data_quality import QualityRules
+
+
+def score(chunk, predictor, rules=None):
+    written = []
+    stats = score_stream([chunk], predictor, 2015, lambda out, first: written.append(out), rules=rules)
+    return written[0], stats
+
+
+def test_unknown_zipcodes_are_rejected_not_priced(sales, fitted_model):
+    chunk = sales.drop(columns=["age_of_house"]).head(6).astype({"zipcode": object})
+    chunk.loc[1, "zipcode"] = 99999
+    chunk.loc[2, "zipcode"] = "not-a-zip"
+    out, stats = score(chunk, CompiledPredictor(fitted_model), QualityRules.from_frame(sales))
+
+    assert out[REJECTED_COLUMN].tolist() == [False, True, True, False, False, False]
+    assert out[PREDICTION_COLUMN].isna().tolist() == [False, True, True, False, False, False]
+    assert stats["quality"].count("unknown_zipcode") == 2
+
+
+def test_known_zipcodes_are_priced_like_the_model(sales, fitted_model):
+    chunk = sales.drop(columns=["age_of_house"]).head(50)
+    out, stats = score(chunk, CompiledPredictor(fitted_model), QualityRules.from_frame(sales))
+    expected = fitted_model.predict(sales.head(50))
+    priced = ~out[REJECTED_COLUMN].to_numpy()
+    assert stats["quality"].count("unknown_zipcode") == 0
+    np.testing.assert_allclose(out[PREDICTION_COLUMN].to_numpy()[priced], expected[priced], rtol=0, atol=0.01)
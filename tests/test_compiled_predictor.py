@@ -0,0 +1,31 @@
+# tests/test_compiled_predictor.py
+import numpy as np
+
+from core.compiled_predictor import CompiledPredictor
+from core.ridge_model import model_frame
+
+RTOL = 1e-8
+
+
+def assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=0)
+
+
+def test_predict_matches_model(sales, fitted_model):
+    X = model_frame(sales)
+    assert_close(CompiledPredictor(fitted_model).predict(X), fitted_model.predict(X))
+
+
+def test_predict_one_matches_model(sales, fitted_model):
+    X = model_frame(sales).head(200)
+    compiled = CompiledPredictor(fitted_model)
+    one_by_one = [compiled.predict_one(row) for row in X.to_dict(orient="records")]
+    assert_close(one_by_one, fitted_model.predict(X))
+
+
+def test_explain_terms_sum_to_prediction(sales, fitted_model):
+    X = model_frame(sales)
+    compiled = CompiledPredictor(fitted_model)
+    base, main, interaction = compiled.explain(X)
+    total = base + main.sum(axis=1) + interaction.sum(axis=1)
+    assert_close(total.to_numpy(), compiled.predict(X))
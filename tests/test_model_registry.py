@@ -0,0 +1,33 @@
+# tests/test_model_registry.py
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core import model_registry
+
+
+@pytest.fixture(autouse=True)
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_DIR", tmp_path)
+    return tmp_path
+
+
+def test_concurrent_saves_of_one_key_leave_a_complete_artifact(model_dir):
+    models = [np.full(200_000, float(i)) for i in range(8)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: model_registry.save("same-key", models[i], {"writer": i}), range(8)))
+
+    model, meta = model_registry.load("same-key")
+    assert np.all(model == model[0]) and len(model) == 200_000
+    assert [p.name for p in model_dir.iterdir() if p.suffix == ".tmp"] == []
+    assert [m["key"] for m in model_registry.list_artifacts()] == ["same-key"]
+
+
+def test_failed_write_leaves_no_temp_file(model_dir):
+    def write(tmp):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        model_registry.atomic_write(model_dir / "x.json", write)
+    assert list(model_dir.iterdir()) == []
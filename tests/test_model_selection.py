@@ -0,0 +1,23 @@
+# tests/test_model_selection.py
+import numpy as np
+import pytest
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+
+from core.model_selection import cross_validate_alphas
+from core.ridge_model import PolyRidgeModel, TARGET, model_frame
+
+ALPHAS = [1.0, 10.0, 1000.0]
+
+
+def test_cv_matches_refitting_each_fold(sales):
+    curve = cross_validate_alphas(sales, alphas=ALPHAS, n_folds=3, random_state=0, max_workers=1)
+
+    X, y = model_frame(sales), sales[TARGET].to_numpy(dtype=np.float64)
+    for alpha, cv_r2 in zip(ALPHAS, curve["cv_r2"]):
+        scores = []
+        for train, held_out in KFold(3, shuffle=True, random_state=0).split(X):
+            # Scaling fitted on the training rows only
+            model = PolyRidgeModel(alpha).fit(X.iloc[train], y[train])
+            scores.append(r2_score(y[held_out], model.predict(X.iloc[held_out])))
+        assert cv_r2 == pytest.approx(np.mean(scores), rel=1e-9)
@@ -0,0 +1,75 @@
+# tests/test_prediction_service.py
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.compiled_predictor import compile_model
+from core.prediction_service import create_server
+from core.ridge_model import model_frame
+
+META = {"key": "test-model", "reference_year": 2015}
+
+
+@pytest.fixture(scope="module")
+def service(fitted_model):
+    server = create_server(compile_model(fitted_model), META, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = body if body is None or isinstance(body, bytes) else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+@pytest.fixture(scope="module")
+def rows(sales):
+    return [
+        {k: v.item() if hasattr(v, "item") else v for k, v in row.items()}
+        for row in model_frame(sales).head(3).to_dict(orient="records")
+    ]
+
+
+def test_health(service):
+    assert request(f"{service}/health") == (200, {"status": "ok", "model": META["key"]})
+
+
+def test_predict_matches_model(service, sales, rows, fitted_model):
+    expected = fitted_model.predict(model_frame(sales).head(3))
+    status, body = request(f"{service}/predict", rows[0])
+    assert status == 200
+    assert body["price"] == pytest.approx(expected[0], rel=1e-8)
+
+    status, body = request(f"{service}/predict/batch", {"rows": rows})
+    assert status == 200
+    assert body["prices"] == pytest.approx(list(expected), rel=1e-8)
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/predict", b"{not json"),
+    ("/predict", [{}]),
+    ("/predict/batch", {"rows": [1, 2]}),
+])
+def test_malformed_payload_is_rejected(service, path, body):
+    status, response = request(f"{service}{path}", body)
+    assert status == 400
+    assert response["error"].startswith("request body must be")
+
+
+@pytest.mark.parametrize("value", [b"NaN", b"Infinity", b"1e999"])
+def test_non_finite_values_are_rejected(service, rows, value):
+    body = json.dumps({**rows[0], "sqft_living": "__value__"}).encode().replace(b'"__value__"', value)
+    assert request(f"{service}/predict", body) == (400, {"error": "non-numeric value for sqft_living"})
+    batch = json.dumps({"rows": [rows[1], {**rows[0], "grade": "__value__"}]}).encode()
+    status, response = request(f"{service}/predict/batch", batch.replace(b'"__value__"', value))
+    assert (status, response) == (400, {"error": "non-numeric value for grade"})
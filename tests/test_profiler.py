@@ -0,0 +1,25 @@
+# tests/test_profiler.py
+import numpy as np
+
+from core.profiler import QUANTILE_CAPACITY, DatasetProfile
+
+QUARTILES = ["25%", "50%", "75%"]
+
+
+def test_in_memory_quantiles_are_exact(sales):
+    profile = DatasetProfile.from_frame(sales, chunk_rows=1500).describe()
+    expected = sales.describe().T
+    columns = expected.index.intersection(profile.index)
+    np.testing.assert_array_equal(profile.loc[columns, QUARTILES].astype(float),
+                                  expected.loc[columns, QUARTILES].astype(float))
+
+
+def test_chunked_quantiles_stay_within_sketch_error(sales):
+    chunks = (sales.iloc[i:i + 500] for i in range(0, len(sales), 500))
+    column = DatasetProfile.from_chunks(chunks).column("sqft_living")
+    assert not column.quantiles.exact
+    values = np.sort(sales["sqft_living"].to_numpy(dtype=np.float64))
+    for q, estimate in zip((0.25, 0.5, 0.75), column.quantiles.quantile([0.25, 0.5, 0.75])):
+        rank = np.searchsorted(values, estimate, side="right") / len(values)
+        assert abs(rank - q) < 0.02, (q, estimate)
+    assert sum(len(level) for level in column.quantiles.levels) < 4 * QUANTILE_CAPACITY
@@ -0,0 +1,60 @@
+# tests/test_training_jobs.py
+from concurrent.futures import Future
+
+import pytest
+
+from core import training_jobs
+from core.training_jobs import TrainingJobRunner, read_status, write_status
+
+KEY = "test-job"
+
+
+class RecordingPool:
+    """Stands in for the process pool: records submissions, runs nothing."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        future = Future()
+        future.set_result(args[0])
+        return future
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(training_jobs, "JOB_DIR", tmp_path)
+    runner = TrainingJobRunner(max_workers=1)
+    runner._pool.shutdown()
+    runner._pool = RecordingPool()
+    return runner
+
+
+def submit(runner, **kwargs):
+    return runner.submit(KEY, "poly_ridge", None, "fingerprint", {}, **kwargs)
+
+
+def test_failed_job_is_not_resubmitted(runner):
+    write_status(KEY, "failed", 1.0, "MemoryError: out of memory")
+    assert not submit(runner)
+    assert not submit(runner)
+    assert runner._pool.submitted == []
+    assert read_status(KEY)["state"] == "failed"
+
+
+def test_retry_resubmits_failed_job(runner):
+    write_status(KEY, "failed", 1.0, "MemoryError: out of memory")
+    assert submit(runner, retry=True)
+    assert len(runner._pool.submitted) == 1
+    assert read_status(KEY)["state"] == "queued"
+
+
+def test_dead_worker_is_recorded_as_failed(runner):
+    write_status(KEY, "running", 0.5, "Accumulating X^T X")
+    future = Future()
+    future.set_exception(RuntimeError("killed"))
+    runner._futures[KEY] = future
+    assert runner.status(KEY)["state"] == "failed"
+    assert not submit(runner)
+    assert runner._pool.submitted == []